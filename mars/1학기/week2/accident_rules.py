@@ -0,0 +1,163 @@
+import re
+import csv
+
+# 사고 판단 규칙 테이블.
+# 예전에는 analyze_logs 안에 'Oxygen tank', 'unstable', 'explosion'을 직접 적어두었기 때문에
+# 사고 유형이 늘어날 때마다 메시지를 한 번씩 더 검사해야 했다.
+# 규칙을 설정 파일(accident_rules.csv)에서 읽고, 규칙이 많으면 모든 패턴을 하나의 정규식으로 합쳐서
+# 규칙 수와 상관없이 메시지를 한 번만 훑도록 한다. (규칙이 적으면 'in' 검사가 더 빠르므로 그대로 사용)
+#
+# 설정 파일 형식 (CSV, 위에서 아래 순서가 우선순위):
+#   kind,pattern,cause
+#   trigger,Oxygen tank,            -> 이 패턴이 있으면 사고 로그로 판단
+#   cause,unstable,산소 탱크가 ...  -> 사고 로그에 이 패턴이 있으면 원인으로 기록 (아래쪽 규칙이 우선)
+
+TRIGGER = 'trigger'
+CAUSE = 'cause'
+
+# 패턴이 이 개수 이하이면 정규식 대신 'pattern in message'로 하나씩 확인한다.
+# 패턴이 적을 때는 문자열 검색 몇 번이 정규식 하나보다 빠르기 때문 (bench_rules.py 기준 200~300개에서 역전)
+SMALL_RULE_COUNT = 200
+
+# 설정 파일이 없을 때 사용하는 기본 규칙 (기존 analyze_logs와 동일)
+DEFAULT_RULES = [
+    (TRIGGER, 'Oxygen tank', ''),
+    (CAUSE, 'unstable', '산소 탱크가 불안정합니다.'),
+    (CAUSE, 'explosion', '불안정한 산소 탱크에 폭발이 발생하여 화성 기지에 피해를 일으켰습니다.'),
+]
+
+
+# 규칙 파일을 읽어 (kind, pattern, cause) 리스트로 반환
+def load_rules(file_path):
+    rules = []
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.DictReader(file)
+            for line_no, row in enumerate(reader, start=2):
+                kind = (row.get('kind') or '').strip()
+                pattern = row.get('pattern') or ''
+                cause = row.get('cause') or ''
+                if kind not in (TRIGGER, CAUSE) or not pattern:
+                    print(f'Warning: 잘못된 규칙이 있어 건너뜁니다 ({file_path}:{line_no}): {row}')
+                    continue
+                rules.append((kind, pattern, cause))
+    except FileNotFoundError:
+        print(f'{file_path} 파일이 없습니다. 기본 규칙으로 실행됩니다.')
+        return list(DEFAULT_RULES)
+    return rules
+
+
+# 문자열 리스트를 트라이 구조의 정규식 문자열로 만든다.
+# ['Oxygen', 'Oxygen tank', 'Oxy'] -> Oxy(?:gen(?:\ tank)?)?
+def build_trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True  # 단어의 끝 표시
+
+    def build(node):
+        is_end = '' in node
+        branches = [re.escape(ch) + build(node[ch]) for ch in sorted(k for k in node if k)]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if is_end else body
+
+    return build(trie)
+
+
+class RuleMatcher:
+    def __init__(self, rules):
+        self.rules = list(rules)
+
+        # 패턴별로 (사고 여부, 가장 우선순위가 높은 원인 규칙 번호)를 미리 계산
+        pattern_info = {}
+        for index, (kind, pattern, _) in enumerate(self.rules):
+            is_trigger, cause_index = pattern_info.get(pattern, (False, -1))
+            if kind == TRIGGER:
+                is_trigger = True
+            else:
+                cause_index = index
+            pattern_info[pattern] = (is_trigger, cause_index)
+
+        # 패턴이 적으면 예전 analyze_logs처럼 'in'으로 하나씩 확인한다 (match 참고)
+        # _small_triggers: 사고 여부를 정하는 패턴, _small_causes: (패턴, 원인)을 우선순위가 높은 순서로
+        self._small = len(pattern_info) <= SMALL_RULE_COUNT
+        self._small_triggers = [pattern for pattern, (is_trigger, _) in pattern_info.items() if is_trigger]
+        causes = sorted((cause_index, pattern) for pattern, (_, cause_index) in pattern_info.items()
+                        if cause_index >= 0)
+        self._small_causes = [(pattern, self.rules[cause_index][2]) for cause_index, pattern in reversed(causes)]
+
+        # 같은 위치에서 시작하는 짧은 패턴은 긴 패턴의 접두사이므로, 가장 긴 패턴만 찾아도
+        # 접두사 패턴까지 함께 처리할 수 있도록 미리 합쳐 둔다. (겹치는 패턴도 놓치지 않기 위함)
+        patterns = list(pattern_info)
+        self._implied = {}
+        for pattern in patterns:
+            is_trigger = False
+            cause_index = -1
+            for other in patterns:
+                if pattern.startswith(other):
+                    other_trigger, other_cause = pattern_info[other]
+                    is_trigger = is_trigger or other_trigger
+                    cause_index = max(cause_index, other_cause)
+            self._implied[pattern] = (is_trigger, cause_index)
+
+        # 모든 패턴을 트라이(trie) 모양의 정규식 하나로 합친다. 예: Oxy(?:gen(?: tank)?)?
+        # 패턴을 단순히 |로 나열하면 위치마다 패턴을 하나씩 비교하지만, 트라이로 만들면 글자 단위로 갈라지므로
+        # 규칙이 많아져도 메시지를 거의 같은 비용으로 한 번만 훑는다.
+        # _search_regex: 패턴이 하나라도 있는지 빠르게 확인 (대부분의 정상 로그는 여기서 끝남)
+        # _find_regex: 전방탐색((?=...))으로 감싸서 각 위치에서 시작하는 가장 긴 패턴을 모두 찾음
+        if patterns:
+            trie_pattern = build_trie_pattern(patterns)
+            self._search_regex = re.compile(trie_pattern)
+            self._find_regex = re.compile('(?=(' + trie_pattern + '))')
+        else:
+            self._search_regex = None
+            self._find_regex = None
+
+        # 병렬 스캐너(parallel_scan)에서 후보 행을 빠르게 찾기 위한 바이트 정규식 (trigger 패턴만 사용)
+        triggers = sorted({p for kind, p, _ in self.rules if kind == TRIGGER}, key=len, reverse=True)
+        if triggers:
+            self.trigger_regex = re.compile(b'|'.join(re.escape(p.encode('utf-8')) for p in triggers))
+        else:
+            self.trigger_regex = None
+
+    # 메시지를 한 번만 훑어서 (사고 여부, 원인)을 반환. match_accident와 같은 형식.
+    def match(self, message):
+        if self._small:
+            return self._match_small(message)
+        if self._search_regex is None:
+            return False, ''
+        first = self._search_regex.search(message)
+        if first is None:
+            return False, ''
+        is_accident = False
+        cause_index = -1
+        for found in self._find_regex.findall(message, first.start()):
+            is_trigger, index = self._implied[found]
+            if is_trigger:
+                is_accident = True
+            if index > cause_index:
+                cause_index = index
+        if not is_accident:
+            return False, ''
+        if cause_index < 0:
+            return True, ''
+        return True, self.rules[cause_index][2]
+
+    # 패턴이 적을 때 사용하는 match. 사고 패턴이 없으면 원인은 확인하지 않고,
+    # 원인은 우선순위가 높은 것부터 확인해서 처음 찾은 것을 반환한다.
+    def _match_small(self, message):
+        for pattern in self._small_triggers:
+            if pattern in message:
+                break
+        else:
+            return False, ''
+        for pattern, cause in self._small_causes:
+            if pattern in message:
+                return True, cause
+        return True, ''
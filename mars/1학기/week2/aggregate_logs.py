@@ -0,0 +1,119 @@
+import os
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import main
+from report_engine import MarkdownReportWriter, render_footer
+
+# 여러 미션의 로그를 한꺼번에 분석해서 하나의 보고서로 합치는 모듈.
+# 디렉토리나 glob 패턴(예: 'archive/*.log.gz')을 받아 로그 파일 목록을 만들고,
+# 파일마다 별도의 프로세스에서 분석하기 때문에 미션 수가 많을수록 코어 수만큼 빨라진다.
+# gzip으로 압축된 로그(.log.gz)도 그대로 읽을 수 있다.
+
+# 디렉토리를 받았을 때 분석할 로그 파일의 확장자
+LOG_SUFFIXES = ('.log', '.log.gz')
+
+
+# 경로 목록(파일, 디렉토리, glob 패턴)을 실제 로그 파일 목록으로 바꿈. 중복은 제거하고 이름순으로 정렬
+def collect_log_files(paths):
+    log_files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                file_path = os.path.join(path, name)
+                if name.endswith(LOG_SUFFIXES) and os.path.isfile(file_path):
+                    log_files.add(file_path)
+        elif os.path.isfile(path):
+            log_files.add(path)
+        else:
+            matched = [p for p in glob.glob(path) if os.path.isfile(p)]
+            if not matched:
+                print(f'Warning: 로그 파일을 찾을 수 없습니다: {path}')
+            log_files.update(matched)
+    return sorted(log_files)
+
+
+# 로그 파일 이름에서 미션 이름을 만듦. 'mission_a.log.gz' -> 'mission_a'
+def mission_name(file_path):
+    name = os.path.basename(file_path)
+    for suffix in ('.gz', '.log'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+
+# 워커 프로세스에서 실행되는 함수. 로그 한 개를 스트리밍으로 분석함
+# 반환값: (파일 경로, 로그 행 수, 사고 로그 리스트, 사고 원인)
+def analyze_mission(file_path, rules_file):
+    if main.RULES_FILE != rules_file:
+        main.set_rules_file(rules_file)
+    counter = {'entry': 0}
+
+    def counted_entries():
+        for entry in main.iter_log_file(file_path):
+            counter['entry'] += 1
+            yield entry
+
+    accident_logs, accident_cause = main.analyze_logs(counted_entries())
+    return file_path, counter['entry'], accident_logs, accident_cause
+
+
+# 여러 로그를 병렬로 분석. 결과는 파일 이름 순서대로 반환
+def analyze_missions(log_files, workers=None, rules_file=None):
+    if rules_file is None:
+        rules_file = main.RULES_FILE
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_mission, log_files, [rules_file] * len(log_files)))
+
+
+# 미션별 구역이 있는 통합 보고서를 작성
+def create_merged_report(results, output_file):
+    total_entries = sum(entry_count for _, entry_count, _, _ in results)
+    total_accidents = sum(len(accident_logs) for _, _, accident_logs, _ in results)
+
+    with MarkdownReportWriter(output_file) as report:
+        report.write_text('# 로그 분석 보고서 (통합)\n\n')
+        report.write_text('## 개요\n')
+        report.write_text(f'미션 {len(results)}개의 로그 {total_entries}행을 분석한 결과입니다. '
+                          f'사고와 관련된 이벤트는 모두 {total_accidents}건입니다.\n\n')
+        report.write_text('| 미션 | 로그 행 수 | 사고 로그 수 | 원인 |\n')
+        report.write_text('|------|-----------|-------------|------|\n')
+        for file_path, entry_count, accident_logs, accident_cause in results:
+            report.write_text(f'| {mission_name(file_path)} | {entry_count} | {len(accident_logs)} | '
+                              f'{accident_cause or "-"} |\n')
+
+        for file_path, entry_count, accident_logs, accident_cause in results:
+            report.write_text(f'\n## 미션: {mission_name(file_path)}\n')
+            report.write_text(f'로그 파일: `{os.path.basename(file_path)}` ({entry_count}행)\n\n')
+            if accident_logs:
+                report.write_text('| 타임스탬프 | 이벤트 | 메시지 |\n')
+                report.write_text('|-----------|-------|---------|\n')
+                report.write_rows(accident_logs)
+            else:
+                report.write_text('사고와 관련된 이벤트가 없습니다.\n')
+            # 원인 분석/결론 구역은 단일 보고서와 같은 문장을 사용하되, 미션 구역 안에 들어가도록 제목 단계를 낮춤
+            report.write_text(render_footer(accident_cause).replace('\n## ', '\n### '))
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description='여러 미션 로그를 병렬로 분석하여 하나의 보고서로 합침')
+    parser.add_argument('paths', nargs='+', help='로그 파일, 디렉토리 또는 glob 패턴 (.log, .log.gz)')
+    parser.add_argument('--output', default='log_analysis_merged.md', help="보고서 파일 경로 ('-'이면 표준 출력)")
+    parser.add_argument('--workers', type=int, default=None, help='워커 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--rules', default=main.RULES_FILE, help='사고 판단 규칙 파일')
+    args = parser.parse_args(argv)
+
+    log_files = collect_log_files(args.paths)
+    if not log_files:
+        print('분석할 로그 파일이 없습니다.')
+        return
+
+    results = analyze_missions(log_files, workers=args.workers, rules_file=args.rules)
+    create_merged_report(results, args.output)
+    if args.output != '-':
+        print(f'미션 {len(results)}개를 분석했습니다. Report created: {args.output}')
+
+
+if __name__ == '__main__':
+    run()
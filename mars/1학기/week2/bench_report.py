@@ -0,0 +1,82 @@
+import os
+import time
+import tempfile
+
+from report_engine import render_report
+
+# 기존 보고서 작성 방식(문장마다 file.write, 행마다 f-string)과 report_engine의 MarkdownReportWriter를 비교하는 벤치마크.
+# 실행: python bench_report.py
+
+ROW_COUNTS = [10000, 100000, 500000]
+# 같은 작업을 REPEAT번 반복해서 가장 빠른 시간을 사용 (디스크 캐시 등의 영향을 줄이기 위함)
+REPEAT = 5
+
+
+# 비교용으로 남겨둔 기존 create_report
+def legacy_create_report(accident_logs, accident_cause, output_file):
+    with open(output_file, mode='w', encoding='utf-8') as file:
+        file.write('# 로그 분석 보고서\n\n')
+        file.write('## 개요\n')
+        file.write('이 보고서는 2023년 8월 27일 임무 중 발생한 로그를 분석한 결과입니다. ')
+        file.write('임무는 성공적으로 마무리하였으나, 산소 탱크에서 문제가 발생한 것으로 확인됩니다. \n\n')
+
+        file.write('## 세부 사항 \n')
+        file.write('로그에서 사고는 임무가 완료된 후 발생한 것으로 나타났습니다.\n')
+        file.write('다음은 산소 탱크와 관련된 이벤트입니다:\n\n')
+
+        file.write('| 타임스탬프 | 이벤트 | 메시지 |\n')
+        file.write('|-----------|-------|---------|\n')
+        for log in accident_logs:
+            file.write(f"| {log['timestamp']} | {log['event']} | {log['message']} |\n")
+
+        file.write('\n## 원인 분석\n')
+        if accident_cause:
+            file.write(f'사고의 원인은 다음과 같을 가능성이 있습니다: **{accident_cause}**.\n')
+        else:
+            file.write('로그에서 사고의 명확한 원인을 찾을 수 없었습니다.\n')
+
+        file.write('\n## 결론\n')
+        file.write('임무는 성공적으로 완료되었지만, 산소 탱크의 폭발로 센터와 임무 통제 시스템의 전원이 꺼졌습니다.\n')
+        file.write('추후에 사고를 방지하기 위해 추가적인 조사가 필요합니다.\n')
+
+
+def make_accident_logs(row_count):
+    return [
+        {
+            'timestamp': f'2023-08-27 {(i // 3600) % 24:02d}:{(i // 60) % 60:02d}:{i % 60:02d}',
+            'event': 'INFO',
+            'message': 'Oxygen tank unstable.' if i % 2 else 'Oxygen tank explosion.',
+        }
+        for i in range(row_count)
+    ]
+
+
+def measure(func, accident_logs, output_file):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(accident_logs, '산소 탱크가 불안정합니다.', output_file)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_file = os.path.join(temp_dir, 'legacy.md')
+        engine_file = os.path.join(temp_dir, 'engine.md')
+        print('| 사고 로그 행 수 | 기존 writer | report_engine | 배율 |')
+        print('|----------------|-------------|---------------|------|')
+        for row_count in ROW_COUNTS:
+            accident_logs = make_accident_logs(row_count)
+            legacy_time = measure(legacy_create_report, accident_logs, legacy_file)
+            engine_time = measure(render_report, accident_logs, engine_file)
+            with open(legacy_file, 'rb') as legacy, open(engine_file, 'rb') as engine:
+                if legacy.read() != engine.read():
+                    print(f'Warning: {row_count}행에서 두 보고서의 내용이 다릅니다.')
+            print(f'| {row_count} | {legacy_time * 1000:.1f} ms | {engine_time * 1000:.1f} ms | '
+                  f'{legacy_time / engine_time:.1f}x |')
+
+
+if __name__ == '__main__':
+    main()
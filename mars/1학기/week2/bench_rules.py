@@ -0,0 +1,95 @@
+import time
+import random
+import string
+
+from accident_rules import TRIGGER, CAUSE, RuleMatcher
+
+# 규칙 수(10, 100, 1000개)에 따른 사고 판단 처리량을 비교하는 벤치마크.
+# naive: 규칙마다 'pattern in message'로 메시지를 다시 훑는 기존 방식
+# matcher: RuleMatcher (규칙이 SMALL_RULE_COUNT개 이하이면 'in' 검사, 많으면 하나로 합친 정규식)
+# 실행: python bench_rules.py
+
+MESSAGE_COUNT = 100000
+RULE_COUNTS = [10, 100, 1000]
+
+BASE_MESSAGES = [
+    'Rocket initialization process started.',
+    'Power systems online. Batteries at optimal charge.',
+    'Communication established with mission control.',
+    'Life support systems nominal.',
+    'Oxygen tank unstable.',
+    'Oxygen tank explosion.',
+    'Center and mission control systems powered down.',
+]
+
+
+def random_word(rng, length):
+    return ''.join(rng.choice(string.ascii_letters) for _ in range(length))
+
+
+# 기존 규칙 3개 + 임의의 규칙으로 rule_count개의 규칙을 만든다.
+def make_rules(rng, rule_count):
+    rules = [
+        (TRIGGER, 'Oxygen tank', ''),
+        (CAUSE, 'unstable', '산소 탱크가 불안정합니다.'),
+        (CAUSE, 'explosion', '불안정한 산소 탱크에 폭발이 발생하여 화성 기지에 피해를 일으켰습니다.'),
+    ]
+    while len(rules) < rule_count:
+        kind = TRIGGER if len(rules) % 2 else CAUSE
+        rules.append((kind, random_word(rng, rng.randint(6, 12)), f'cause {len(rules)}'))
+    return rules
+
+
+# 메시지의 일부에는 임의 규칙의 패턴을 섞어 넣어 실제로 여러 규칙이 맞도록 한다.
+def make_messages(rng, rules):
+    messages = []
+    for _ in range(MESSAGE_COUNT):
+        message = rng.choice(BASE_MESSAGES)
+        if rng.random() < 0.1:
+            message = f'{message} {rng.choice(rules)[1]}'
+        messages.append(message)
+    return messages
+
+
+# 규칙마다 메시지를 다시 훑는 기존 방식과 같은 판단 함수
+def naive_match(rules, message):
+    is_accident = False
+    cause = ''
+    for kind, pattern, rule_cause in rules:
+        if pattern in message:
+            if kind == TRIGGER:
+                is_accident = True
+            else:
+                cause = rule_cause
+    return (is_accident, cause) if is_accident else (False, '')
+
+
+def measure(func, messages):
+    start = time.perf_counter()
+    results = [func(message) for message in messages]
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def main():
+    rng = random.Random(42)
+    print(f'메시지 {MESSAGE_COUNT}개 기준 처리량 (messages/s)')
+    print('| 규칙 수 | naive | matcher | 배율 |')
+    print('|--------|-------|---------|------|')
+    for rule_count in RULE_COUNTS:
+        rules = make_rules(rng, rule_count)
+        messages = make_messages(rng, rules)
+        matcher = RuleMatcher(rules)
+
+        naive_results, naive_time = measure(lambda message: naive_match(rules, message), messages)
+        matcher_results, matcher_time = measure(matcher.match, messages)
+        if naive_results != matcher_results:
+            print(f'Warning: 규칙 {rule_count}개에서 두 방식의 결과가 다릅니다.')
+
+        naive_rate = MESSAGE_COUNT / naive_time
+        matcher_rate = MESSAGE_COUNT / matcher_time
+        print(f'| {rule_count} | {naive_rate:,.0f} | {matcher_rate:,.0f} | {matcher_rate / naive_rate:.1f}x |')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import os
+import csv
+import json
+import time
+import hashlib
+
+import main
+from main import print_log_entry, write_report_header, write_report_row, write_report_footer
+
+# 실행 중인 미션 로그를 따라가며(tail -f처럼) 보고서를 조금씩 갱신하는 모듈.
+# 마지막으로 읽은 로그의 바이트 위치와 보고서의 표가 끝나는 위치를 상태 파일에 저장해 두고,
+# 다음 실행 때는 새로 추가된 행만 분석해서 보고서의 표 뒤에 이어 붙인다.
+# 그래서 1분마다 실행해도 전체 로그 크기가 아니라 새로 들어온 데이터 양만큼만 시간이 걸린다.
+# 상태 파일에는 사용한 규칙의 해시도 저장해서, 규칙이 바뀌면 이전 행과 기준이 섞이지 않도록 처음부터 다시 분석한다.
+
+
+# 규칙 목록의 해시. 규칙 파일의 경로가 아니라 내용(읽어 들인 규칙)이 같은지를 비교함
+def rules_fingerprint(rules):
+    return hashlib.blake2b(repr(list(rules)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+# 상태 파일을 읽어 딕셔너리로 반환. 없거나 깨져 있으면 None
+def load_state(state_file):
+    try:
+        with open(state_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+# 중간에 프로그램이 꺼져도 상태 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체함
+def save_state(state_file, state):
+    temp_file = state_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(state, file, ensure_ascii=False)
+    os.replace(temp_file, state_file)
+
+
+# 저장된 상태를 그대로 이어서 쓸 수 있는지 확인.
+# 로그 파일이 교체(로테이션)되었거나 줄어들었거나, 보고서가 다른 방법으로 다시 만들어졌거나,
+# 사고 판단 규칙이 바뀌었다면 처음부터 다시 분석함
+def is_state_valid(state, log_stat, output_file, rules_id):
+    if not state:
+        return False
+    if state.get('log_inode') != log_stat.st_ino or log_stat.st_size < state.get('offset', 0):
+        return False
+    if state.get('rules') != rules_id:
+        return False
+    try:
+        return os.path.getsize(output_file) == state.get('report_size')
+    except OSError:
+        return False
+
+
+# 새로 추가된 로그만 분석해 보고서를 갱신하는 함수. 한 번 실행할 때마다 한 번 호출됨.
+# rules_file을 주지 않으면 main에 설정된 규칙 파일을 사용함 (parallel_scan.analyze_logs_parallel과 같음)
+# 반환값: 이번에 새로 읽은 로그 행 수
+def update_report(log_file, output_file, state_file, echo=False, rules_file=None):
+    try:
+        log_stat = os.stat(log_file)
+    except FileNotFoundError as e:
+        print(f'파일을 읽는 중 에러가 발생했습니다: {e}')
+        return 0
+
+    # main.py를 스크립트로 실행하면 이 모듈이 import한 main은 별도의 모듈이므로 규칙 파일을 직접 넘겨받아 설정함
+    if rules_file is not None and main.RULES_FILE != rules_file:
+        main.set_rules_file(rules_file)
+    matcher = main.get_rule_matcher()
+    rules_id = rules_fingerprint(matcher.rules)
+
+    state = load_state(state_file)
+    if not is_state_valid(state, log_stat, output_file, rules_id):
+        # 처음 실행이거나 이어서 쓸 수 없는 경우: 보고서 머리말부터 새로 작성
+        with open(output_file, mode='w', encoding='utf-8', newline='') as report:
+            write_report_header(report)
+            table_end = report.tell()
+        state = {
+            'log_inode': log_stat.st_ino,
+            'offset': 0,
+            'fieldnames': None,
+            'accident_cause': '',
+            'table_end': table_end,
+            'rules': rules_id,
+        }
+
+    new_rows = 0
+    accident_cause = state['accident_cause']
+    with open(log_file, 'rb') as log, open(output_file, mode='r+', encoding='utf-8', newline='') as report:
+        log.seek(state['offset'])
+        # 표의 끝(원인 분석 앞)으로 이동해서 맺음말을 지우고 새 행을 이어 씀
+        report.seek(state['table_end'])
+        report.truncate()
+
+        for line in iter(log.readline, b''):
+            # 아직 다 쓰이지 않은 마지막 줄은 다음 실행 때 처리
+            if not line.endswith(b'\n'):
+                break
+            state['offset'] += len(line)
+            text = line.decode('utf-8')
+            if state['fieldnames'] is None:
+                state['fieldnames'] = next(csv.reader([text]), [])
+                continue
+            for entry in csv.DictReader([text], fieldnames=state['fieldnames']):
+                new_rows += 1
+                if echo:
+                    print_log_entry(entry)
+                is_accident, cause = matcher.match(entry['message'])
+                if is_accident:
+                    write_report_row(report, entry)
+                    if cause:
+                        accident_cause = cause
+
+        state['table_end'] = report.tell()
+        write_report_footer(report, accident_cause)
+        state['report_size'] = report.tell()
+
+    state['accident_cause'] = accident_cause
+    save_state(state_file, state)
+    return new_rows
+
+
+# 로그를 계속 따라가며 interval초마다 보고서를 갱신. Ctrl+C로 종료
+def follow(log_file, output_file, state_file, interval=1.0, echo=True, rules_file=None):
+    print(f'{log_file} 을(를) 따라가는 중입니다. 종료하려면 Ctrl+C를 누르세요.')
+    try:
+        while True:
+            new_rows = update_report(log_file, output_file, state_file, echo=echo, rules_file=rules_file)
+            if new_rows:
+                print(f'새 로그 {new_rows}행을 분석하여 보고서를 갱신했습니다: {output_file}')
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('\n따라가기를 종료합니다.')
@@ -0,0 +1,220 @@
+import os
+import csv
+import mmap
+import struct
+import bisect
+import argparse
+
+from main import print_log_entry
+
+# 미션 로그의 타임스탬프 -> 바이트 위치 색인(sidecar index).
+# "10:30부터 11:00 사이에 무슨 일이 있었지?" 같은 질문에 답하려면 지금은 로그 전체를 읽어야 한다.
+# 로그 옆에 mission_computer_main.log.idx 파일을 만들어 두고, 일정 간격(stride)마다
+# 한 줄의 (타임스탬프, 바이트 위치)를 기록해 둔다. 조회할 때는 색인을 이분 탐색해서 범위의 시작 근처로
+# 바로 이동(seek)하기 때문에 10GB짜리 로그도 몇 밀리초 안에 결과가 나온다.
+# (로그는 시간 순서대로 쌓인다고 가정함)
+#
+# 색인 파일 형식 (little endian):
+#   헤더: magic(8바이트) | 로그 inode(8) | 색인할 때의 로그 크기(8) | stride(8) | 항목 수(8)
+#   항목: 타임스탬프(19바이트, 'YYYY-MM-DD HH:MM:SS') | 줄의 시작 위치(8)
+
+INDEX_MAGIC = b'MLOGIDX1'
+HEADER_FORMAT = '<8sQQQQ'
+ENTRY_FORMAT = '<19sQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+ENTRY_SIZE = struct.calcsize(ENTRY_FORMAT)
+TIMESTAMP_SIZE = 19
+
+# 색인 간격 기본값 (64KB). 조회 시 최대 이만큼만 앞에서부터 읽으면 범위의 시작에 도착함
+DEFAULT_STRIDE = 64 * 1024
+
+
+def index_path_for(log_file):
+    return log_file + '.idx'
+
+
+# 색인 파일을 열지 않고 헤더만 읽음. 색인이 없거나 형식이 다르면 None
+def read_index_header(index_file):
+    try:
+        with open(index_file, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER_SIZE:
+        return None
+    magic, inode, indexed_size, stride, count = struct.unpack(HEADER_FORMAT, header)
+    if magic != INDEX_MAGIC:
+        return None
+    return {'inode': inode, 'indexed_size': indexed_size, 'stride': stride, 'count': count}
+
+
+# 로그의 pos 위치 이후에 처음으로 시작되는 줄을 찾아 (줄의 시작 위치, 타임스탬프)를 반환.
+# 완성되지 않은 마지막 줄만 남았으면 None
+def next_line_at(log, pos, data_start):
+    if pos <= data_start:
+        log.seek(data_start)
+    else:
+        # pos-1이 속한 줄을 건너뛰면 pos 이후에 시작하는 첫 줄이 나옴
+        log.seek(pos - 1)
+        log.readline()
+    line_start = log.tell()
+    line = log.readline()
+    if not line.endswith(b'\n'):
+        return None
+    return line_start, line[:TIMESTAMP_SIZE]
+
+
+# 색인을 만들거나, 로그가 늘어났다면 늘어난 부분만 색인에 추가함.
+# 로그 전체를 읽지 않고 stride 간격으로 seek해서 한 줄씩만 읽기 때문에 큰 로그도 금방 만들어짐.
+def build_index(log_file, index_file=None, stride=DEFAULT_STRIDE):
+    if index_file is None:
+        index_file = index_path_for(log_file)
+    log_stat = os.stat(log_file)
+    header = read_index_header(index_file)
+
+    # 같은 로그이고 색인 이후로 로그가 줄어들지 않았다면 이어서 색인함
+    if (header and header['inode'] == log_stat.st_ino and header['stride'] == stride
+            and header['indexed_size'] <= log_stat.st_size):
+        if header['indexed_size'] == log_stat.st_size:
+            return header['count']
+        mode = 'r+b'
+    else:
+        header = None
+        mode = 'w+b'
+
+    with open(log_file, 'rb') as log, open(index_file, mode) as index:
+        data_start = len(log.readline())
+        if header is None:
+            count = 0
+            pos = data_start
+            index.write(struct.pack(HEADER_FORMAT, INDEX_MAGIC, log_stat.st_ino, 0, stride, 0))
+        else:
+            count = header['count']
+            # 마지막 항목의 위치에서 stride만큼 떨어진 곳부터 이어서 색인
+            if count:
+                index.seek(HEADER_SIZE + (count - 1) * ENTRY_SIZE)
+                _, last_offset = struct.unpack(ENTRY_FORMAT, index.read(ENTRY_SIZE))
+                pos = last_offset + stride
+            else:
+                pos = data_start
+            index.seek(HEADER_SIZE + count * ENTRY_SIZE)
+
+        log.seek(0, os.SEEK_END)
+        log_size = log.tell()
+        entries = []
+        while pos < log_size:
+            found = next_line_at(log, pos, data_start)
+            if found is None:
+                # 아직 쓰는 중인 마지막 줄. 다음에 색인을 갱신할 때 같은 위치부터 다시 확인함
+                break
+            line_start, timestamp = found
+            entries.append(struct.pack(ENTRY_FORMAT, timestamp, line_start))
+            pos = line_start + stride
+        index.write(b''.join(entries))
+        count += len(entries)
+
+        index.seek(0)
+        index.write(struct.pack(HEADER_FORMAT, INDEX_MAGIC, log_stat.st_ino, log_size, stride, count))
+    return count
+
+
+# 메모리 맵으로 연 색인을 bisect가 다룰 수 있는 시퀀스처럼 보이게 하는 클래스 (타임스탬프만 돌려줌)
+class _IndexTimestamps:
+    def __init__(self, mm, count):
+        self.mm = mm
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = HEADER_SIZE + i * ENTRY_SIZE
+        return self.mm[start:start + TIMESTAMP_SIZE]
+
+
+# 색인에서 start 이전의 마지막 항목을 찾아 로그를 읽기 시작할 위치를 반환
+def find_start_offset(index_file, start):
+    with open(index_file, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            count = struct.unpack(HEADER_FORMAT, mm[:HEADER_SIZE])[4]
+            if count == 0:
+                return None
+            position = bisect.bisect_left(_IndexTimestamps(mm, count), start.encode('ascii')) - 1
+            entry_start = HEADER_SIZE + max(position, 0) * ENTRY_SIZE
+            _, offset = struct.unpack(ENTRY_FORMAT, mm[entry_start:entry_start + ENTRY_SIZE])
+            return offset
+
+
+# 'HH:MM' 처럼 날짜가 없는 시간은 로그 첫 행의 날짜를 붙여서 완전한 타임스탬프로 만듦
+def normalize_time(value, log_file):
+    value = value.strip()
+    if len(value) <= 8 and ':' in value:
+        with open(log_file, 'r', encoding='utf-8') as file:
+            file.readline()
+            first_date = file.readline()[:10]
+        value = f'{first_date} {value}'
+    return value
+
+
+# start ~ end 사이(양 끝 포함)의 로그를 한 행씩 돌려주는 제너레이터.
+# end가 '2023-08-27 11:00' 처럼 짧으면 11:00:59까지 포함함 (앞부분이 같으면 범위 안으로 봄)
+def read_log_range(log_file, start, end, index_file=None):
+    if index_file is None:
+        index_file = index_path_for(log_file)
+    header = read_index_header(index_file)
+    log_stat = os.stat(log_file)
+    # 색인이 없거나 로그가 바뀌었으면 먼저 색인을 갱신 (늘어난 부분만 추가됨)
+    if header is None:
+        build_index(log_file, index_file)
+    elif header['inode'] != log_stat.st_ino or header['indexed_size'] != log_stat.st_size:
+        build_index(log_file, index_file, stride=header['stride'])
+
+    offset = find_start_offset(index_file, start)
+    if offset is None:
+        return
+
+    with open(log_file, 'rb') as file:
+        fieldnames = next(csv.reader([file.readline().decode('utf-8')]), [])
+        file.seek(offset)
+        for line in file:
+            # 아직 쓰는 중인 마지막 줄은 조회하지 않음
+            if not line.endswith(b'\n'):
+                break
+            for entry in csv.DictReader([line.decode('utf-8')], fieldnames=fieldnames):
+                timestamp = entry['timestamp']
+                if timestamp < start:
+                    continue
+                if timestamp[:len(end)] > end:
+                    return
+                yield entry
+
+
+def main(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    default_log = os.path.join(script_dir, 'mission_computer_main.log')
+
+    parser = argparse.ArgumentParser(description='미션 로그 타임스탬프 색인 및 시간 범위 조회')
+    parser.add_argument('--log', default=default_log, help='로그 파일 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='색인 만들기 / 갱신')
+    build_parser.add_argument('--stride', type=int, default=DEFAULT_STRIDE, help='색인 간격(바이트)')
+    query_parser = subparsers.add_parser('query', help='시간 범위 조회 (예: query 10:30 11:00)')
+    query_parser.add_argument('start', help="시작 시간 ('YYYY-MM-DD HH:MM:SS' 또는 'HH:MM')")
+    query_parser.add_argument('end', help="끝 시간 ('YYYY-MM-DD HH:MM:SS' 또는 'HH:MM')")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'build':
+            count = build_index(args.log, stride=args.stride)
+            print(f'색인 항목 {count}개: {index_path_for(args.log)}')
+            return
+        start = normalize_time(args.start, args.log)
+        end = normalize_time(args.end, args.log)
+        for entry in read_log_range(args.log, start, end):
+            print_log_entry(entry)
+    except FileNotFoundError as e:
+        print(f'파일을 읽는 중 에러가 발생했습니다: {e}')
+
+
+if __name__ == '__main__':
+    main()
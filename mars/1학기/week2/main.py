@@ -1,5 +1,11 @@
 import os
 import csv
+import argparse
+import gzip
+import itertools
+
+from accident_rules import RuleMatcher, load_rules
+from report_engine import REPORT_HEADER, MarkdownReportWriter, render_footer, render_report, render_row
 
 #로그파일을 읽어오는 함수.
 def read_log_file(file_path):
@@ -16,26 +22,78 @@ def read_log_file(file_path):
     return []
 #파일을 닫는 close 필요, 다만 with open를 쓰면 자동으로 close를 해주긴 함. with만 쓰는 경우에는 close가 필요
 
+# 이름이 .gz로 끝나는 로그는 gzip으로 압축된 것으로 보고 풀면서 읽는다.
+def open_log_file(file_path):
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rt', encoding='utf-8', newline='')
+    return open(file_path, 'r', encoding='utf-8', newline='')
+
+# 스트리밍 모드용 로그 읽기 함수.
+# read_log_file은 전체 로그를 리스트로 만들기 때문에 로그가 커지면 메모리도 같이 커진다.
+# 제너레이터로 한 행씩 돌려주면 로그 크기와 상관없이 메모리 사용량이 일정하게 유지됨.
+def iter_log_file(file_path):
+    try:
+        with open_log_file(file_path) as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield row
+    # 파일이 존재하지 않거나 압축이 깨진 경우 예외처리 (read_log_file과 동일한 메시지)
+    except (FileNotFoundError, gzip.BadGzipFile, EOFError) as e:
+        print(f'파일을 읽는 중 에러가 발생했습니다: {e}')
+
+# 로그의 첫 행과, 첫 행부터 다시 시작하는 전체 행 제너레이터를 반환.
+# 보고서 파일을 열면 기존 내용이 지워지므로, 로그를 읽을 수 있는지 먼저 확인할 때 사용함.
+# 로그가 없거나 비어 있으면 첫 행은 None
+def peek_log_file(file_path):
+    entries = iter_log_file(file_path)
+    first = next(entries, None)
+    if first is None:
+        return None, iter(())
+    return first, itertools.chain([first], entries)
+
+def print_log_entry(log):
+    print(f"| {log['timestamp']} | {log['event']} | {log['message']} |")
+
 def print_log_to_screen(log_entries):
     # 로그 항목을 화면에 출력
     if log_entries:
         for log in log_entries:
-            print(f"| {log['timestamp']} | {log['event']} | {log['message']} |")
+            print_log_entry(log)
     else:
         print('로그 파일이 비어 있거나 읽을 수 없습니다.')
 
+# 사고 판단 규칙 파일 (main.py와 같은 위치)
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'accident_rules.csv')
+_rule_matcher = None
+
+# 사고 판단에 사용할 규칙 파일을 바꾸는 함수. 규칙은 하나의 정규식으로 미리 컴파일해 둠.
+def set_rules_file(file_path):
+    global _rule_matcher, RULES_FILE
+    RULES_FILE = file_path
+    _rule_matcher = RuleMatcher(load_rules(file_path))
+
+def get_rule_matcher():
+    if _rule_matcher is None:
+        set_rules_file(RULES_FILE)
+    return _rule_matcher
+
+# 한 행의 메시지가 사고 로그인지와 그 원인을 판단하는 함수.
+# 사고 로그가 아니면 (False, ''), 원인을 알 수 없으면 (True, '')를 반환함.
+# 판단 기준은 accident_rules.csv의 규칙을 따르며 규칙 수와 상관없이 메시지를 한 번만 훑는다.
+def match_accident(message):
+    return get_rule_matcher().match(message)
+
 def analyze_logs(log_entries):
     accident_logs = []
     accident_cause = ''
 # 이건 사고의 원인이 된 요소를 선택해 출력한것, 특정 시간대 이후의 로그를 출력하는 방법도 있음.
+    # log_entries는 리스트뿐 아니라 iter_log_file 같은 제너레이터도 받을 수 있음
     for entry in log_entries:
-        # 로그 항목이 'Oxygen tank'를 포함하는지 확인
-        if 'Oxygen tank' in entry['message']:
+        is_accident, cause = match_accident(entry['message'])
+        if is_accident:
             accident_logs.append(entry)
-            if 'unstable' in entry['message']:
-                accident_cause = '산소 탱크가 불안정합니다.'
-            if 'explosion' in entry['message']:
-                accident_cause = '불안정한 산소 탱크에 폭발이 발생하여 화성 기지에 피해를 일으켰습니다.'
+            if cause:
+                accident_cause = cause
 
     return accident_logs, accident_cause
 
@@ -43,50 +101,124 @@ def analyze_logs(log_entries):
 #다른 로그파일을 받을 경우나 코드를 돌릴 경우에는 정적이기 때문에 다른 로그파일에는 대응이 어렵다. 
 #재사용에는 어려움이 따른다는 점이 아쉽다.
 #나중에 수정이 필요함. 동적으로 하려면 어떻게 해야할까? 
+# -> 보고서를 머리말 / 표의 행 / 맺음말로 나누어서 스트리밍 모드에서도 같은 함수를 쓰도록 함
+# -> 보고서 문구는 report_engine.py에 한 번만 정의해 두고 여기서는 가져다 씀
+def write_report_header(file):
+    file.write(REPORT_HEADER)
+
+def write_report_row(file, log):
+    file.write(render_row(log))
+
+def write_report_footer(file, accident_cause):
+    file.write(render_footer(accident_cause))
+
+# 보고서 작성은 MarkdownReportWriter가 표의 행을 묶어서 큰 버퍼로 한 번에 쓴다.
+# output_file을 '-'로 주면 표준 출력으로 내보냄
 def create_report(accident_logs, accident_cause, output_file):
-    with open(output_file, mode='w', encoding='utf-8') as file:
-        file.write('# 로그 분석 보고서\n\n')
-        file.write('## 개요\n')
-        file.write('이 보고서는 2023년 8월 27일 임무 중 발생한 로그를 분석한 결과입니다. ')
-        file.write('임무는 성공적으로 마무리하였으나, 산소 탱크에서 문제가 발생한 것으로 확인됩니다. \n\n')
-
-        file.write('## 세부 사항 \n')
-        file.write('로그에서 사고는 임무가 완료된 후 발생한 것으로 나타났습니다.\n')
-        file.write('다음은 산소 탱크와 관련된 이벤트입니다:\n\n')
-
-        file.write('| 타임스탬프 | 이벤트 | 메시지 |\n')
-        file.write('|-----------|-------|---------|\n')
-        for log in accident_logs:
-            file.write(f"| {log['timestamp']} | {log['event']} | {log['message']} |\n")
-
-        file.write('\n## 원인 분석\n')
-        if accident_cause:
-            file.write(f'사고의 원인은 다음과 같을 가능성이 있습니다: **{accident_cause}**.\n')
-        else:
-            file.write('로그에서 사고의 명확한 원인을 찾을 수 없었습니다.\n')
+    render_report(accident_logs, accident_cause, output_file)
+
+# 스트리밍 모드 보고서 작성 함수.
+# 로그를 한 행씩 받아서 화면 출력 -> 사고 판단 -> 보고서 기록까지 바로 처리하기 때문에
+# 사고 로그를 리스트로 모아두지 않는다. 표가 원인 분석보다 먼저 나오므로 원인은 마지막에 기록하면 됨.
+# 반환값: (읽은 로그 수, 사고 로그 수, 사고 원인)
+def create_report_streaming(log_entries, output_file, echo=True):
+    counts = {'entry': 0, 'cause': ''}
 
-        file.write('\n## 결론\n')
-        file.write('임무는 성공적으로 완료되었지만, 산소 탱크의 폭발로 센터와 임무 통제 시스템의 전원이 꺼졌습니다.\n')
-        file.write('추후에 사고를 방지하기 위해 추가적인 조사가 필요합니다.\n')
+    # 사고 로그만 골라서 하나씩 돌려주는 제너레이터. 보고서 엔진이 이것을 묶어서 기록함
+    def accident_entries():
+        for entry in log_entries:
+            counts['entry'] += 1
+            if echo:
+                print_log_entry(entry)
+            is_accident, cause = match_accident(entry['message'])
+            if is_accident:
+                if cause:
+                    counts['cause'] = cause
+                yield entry
 
+    with MarkdownReportWriter(output_file) as report:
+        report.write_header()
+        accident_count = report.write_rows(accident_entries())
+        report.write_footer(counts['cause'])
+    return counts['entry'], accident_count, counts['cause']
 
 
 
+
+def print_report_created(output_file):
+    if output_file != '-':
+        print(f"Report created: {output_file}")
+
 # 메인 함수
-def main():
+# --stream 옵션을 주면 로그 전체를 메모리에 올리지 않고 한 행씩 처리함
+# --parallel 옵션을 주면 로그를 메모리 맵으로 열어 여러 프로세스에서 나누어 검사함
+# --incremental 옵션은 지난 실행 이후 추가된 로그만 분석해 보고서를 갱신하고, --follow는 이를 계속 반복함
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='화성 기지 미션 로그 분석기')
+    parser.add_argument('--stream', action='store_true', help='로그를 한 행씩 읽어 메모리 사용량을 일정하게 유지')
+    parser.add_argument('--parallel', action='store_true', help='여러 코어로 사고 로그를 검사 (로그는 화면에 출력하지 않음)')
+    parser.add_argument('--workers', type=int, default=None, help='--parallel 모드의 워커 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--incremental', action='store_true', help='지난 실행 이후 추가된 로그만 분석하여 보고서를 갱신')
+    parser.add_argument('--follow', action='store_true', help='로그를 계속 따라가며 보고서를 갱신 (Ctrl+C로 종료)')
+    parser.add_argument('--interval', type=float, default=1.0, help='--follow 모드에서 로그를 확인하는 간격(초)')
+    parser.add_argument('--rules', default=RULES_FILE, help='사고 판단 규칙 파일 (기본값: accident_rules.csv)')
+    parser.add_argument('--output', default=None, help="보고서 파일 경로 ('-'이면 표준 출력, 기본값: log_analysis.md)")
+    parser.add_argument('--quiet', action='store_true', help='로그를 화면에 출력하지 않음')
+    args = parser.parse_args(argv)
+    set_rules_file(args.rules)
+
     # 현재 스크립트의 디렉토리 경로를 가져옴
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
     log_file = os.path.join(script_dir, 'mission_computer_main.log')  # 로그 파일 경로 설정
     
     # 보고서 파일을 main.py와 동일한 위치에 생성
-    output_file = os.path.join(script_dir, 'log_analysis.md')
+    output_file = args.output or os.path.join(script_dir, 'log_analysis.md')
+    # 보고서를 표준 출력으로 내보낼 때는 로그 출력과 안내 문구가 섞이지 않도록 화면 출력을 끔
+    to_stdout = output_file == '-'
+    echo = not (args.quiet or to_stdout)
+    # --incremental / --follow 모드에서 읽은 위치를 기억하는 상태 파일
+    state_file = os.path.join(script_dir, 'log_analysis.state.json')
+
+    if args.incremental or args.follow:
+        if to_stdout:
+            print("--incremental / --follow 모드는 보고서를 파일로만 저장할 수 있습니다.")
+            return
+        # follow_log가 main을 import하므로 순환 import를 피하기 위해 여기서 불러옴
+        from follow_log import follow, update_report
+        if args.follow:
+            follow(log_file, output_file, state_file, interval=args.interval, echo=echo, rules_file=args.rules)
+        else:
+            new_rows = update_report(log_file, output_file, state_file, echo=echo, rules_file=args.rules)
+            print(f"새 로그 {new_rows}행을 분석했습니다. Report updated: {output_file}")
+        return
+
+    if args.parallel or args.stream:
+        # 기본 모드와 같이 로그를 읽을 수 없으면 기존 보고서를 건드리지 않음
+        first_entry, log_entries = peek_log_file(log_file)
+        if first_entry is None:
+            print("로그 파일이 비어 있거나 읽을 수 없습니다.")
+            return
+
+    if args.parallel:
+        # parallel_scan이 main을 import하므로 순환 import를 피하기 위해 여기서 불러옴
+        from parallel_scan import analyze_logs_parallel
+        accident_logs, accident_cause = analyze_logs_parallel(log_file, workers=args.workers, rules_file=args.rules)
+        create_report(accident_logs, accident_cause, output_file)
+        print_report_created(output_file)
+        return
+
+    if args.stream:
+        create_report_streaming(log_entries, output_file, echo=echo)
+        print_report_created(output_file)
+        return
 
     # 1. 로그 파일 읽기
     log_entries = read_log_file(log_file)
 
     # 2. 화면에 로그 출력
-    print_log_to_screen(log_entries)
+    if echo:
+        print_log_to_screen(log_entries)
 
     if not log_entries:
         print("로그 파일이 비어 있거나 읽을 수 없습니다.")
@@ -97,7 +229,7 @@ def main():
 
     # 3. 보고서 생성
     create_report(accident_logs, accident_cause, output_file)
-    print(f"Report created: {output_file}")
+    print_report_created(output_file)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,124 @@
+import os
+import csv
+import mmap
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+import main
+from main import print_log_entry
+
+# 수십 GB짜리 미션 로그를 여러 코어로 나누어 검사하는 스캐너.
+# 로그를 메모리 맵(mmap)으로 열고, 줄바꿈 경계에 맞춰 청크로 나눈 뒤
+# 각 청크를 별도의 워커 프로세스에서 검사한다. 결과는 타임스탬프 순서로 합친다.
+
+# 청크 하나의 기본 크기 (64MB)
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+# 로그 파일의 헤더(첫 줄)를 읽어서 필드 이름과 데이터가 시작되는 위치를 반환
+def read_header(file_path):
+    with open(file_path, 'rb') as file:
+        header_line = file.readline()
+    fieldnames = next(csv.reader([header_line.decode('utf-8')]), [])
+    return fieldnames, len(header_line)
+
+
+# 파일을 chunk_size 단위로 나누되, 각 청크가 줄의 중간에서 끊기지 않도록 경계를 다음 줄바꿈 뒤로 옮김.
+# 반환값: [(시작, 끝), ...] 바이트 범위 리스트
+def split_chunks(file_path, data_start, chunk_size=DEFAULT_CHUNK_SIZE):
+    file_size = os.path.getsize(file_path)
+    if file_size <= data_start:
+        return []
+
+    chunks = []
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = data_start
+            while start < file_size:
+                end = min(start + chunk_size, file_size)
+                if end < file_size:
+                    newline = mm.find(b'\n', end - 1)
+                    end = file_size if newline == -1 else newline + 1
+                chunks.append((start, end))
+                start = end
+    return chunks
+
+
+# 워커 프로세스에서 실행되는 함수. 한 청크 안에서 사고 키워드(trigger 규칙)가 포함된 행만 찾아 파싱함.
+# 반환값: (사고 로그 리스트, 청크 안에서 마지막으로 발견된 원인)
+def scan_chunk(file_path, fieldnames, start, end, rules_file):
+    # 워커 프로세스마다 규칙을 한 번만 컴파일함
+    if main.RULES_FILE != rules_file:
+        main.set_rules_file(rules_file)
+    matcher = main.get_rule_matcher()
+    keyword = matcher.trigger_regex
+    accident_logs = []
+    accident_cause = ''
+    if keyword is None:
+        return accident_logs, accident_cause
+
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            found = keyword.search(mm, start, end)
+            while found:
+                pos = found.start()
+                # 키워드가 포함된 행의 시작과 끝을 찾음
+                line_start = mm.rfind(b'\n', start, pos) + 1
+                if line_start == 0:
+                    line_start = start
+                line_end = mm.find(b'\n', pos, end)
+                if line_end == -1:
+                    line_end = end
+
+                line = mm[line_start:line_end].decode('utf-8')
+                # csv.DictReader로 파싱해야 열 개수가 맞지 않는 행도 단일 스레드와 똑같이 처리됨
+                entry = next(csv.DictReader([line], fieldnames=fieldnames))
+                # 키워드가 메시지가 아닌 다른 필드에 있을 수도 있으므로 단일 스레드와 같은 판단 함수로 다시 확인
+                is_accident, cause = matcher.match(entry.get('message') or '')
+                if is_accident:
+                    accident_logs.append(entry)
+                    if cause:
+                        accident_cause = cause
+
+                # 같은 행에 키워드가 여러 번 있어도 한 번만 처리하도록 다음 행부터 다시 검색
+                found = keyword.search(mm, line_end, end)
+    return accident_logs, accident_cause
+
+
+# 로그 파일을 병렬로 검사하여 analyze_logs와 같은 형식의 결과를 반환
+def analyze_logs_parallel(file_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, rules_file=None):
+    if rules_file is None:
+        rules_file = main.RULES_FILE
+    try:
+        fieldnames, data_start = read_header(file_path)
+        chunks = split_chunks(file_path, data_start, chunk_size)
+    except FileNotFoundError as e:
+        print(f'파일을 읽는 중 에러가 발생했습니다: {e}')
+        return [], ''
+
+    if not chunks:
+        return [], ''
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scan_chunk, file_path, fieldnames, start, end, rules_file) for start, end in chunks]
+        # 파일 순서대로 결과를 받아야 원인(마지막으로 발견된 원인)이 단일 스레드와 같아짐
+        results = [future.result() for future in futures]
+
+    # 각 청크의 결과는 이미 파일 순서이므로 타임스탬프 기준으로 병합.
+    # heapq.merge는 타임스탬프가 같으면 앞 청크의 로그를 먼저 내보내기 때문에 순서가 안정적임.
+    accident_logs = list(heapq.merge(*[logs for logs, _ in results], key=lambda log: log.get('timestamp', '')))
+
+    accident_cause = ''
+    for _, cause in results:
+        if cause:
+            accident_cause = cause
+    return accident_logs, accident_cause
+
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    log_file = os.path.join(script_dir, 'mission_computer_main.log')
+    logs, cause = analyze_logs_parallel(log_file)
+    for log in logs:
+        print_log_entry(log)
+    print(f'원인: {cause}')
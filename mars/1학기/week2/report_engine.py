@@ -0,0 +1,142 @@
+import os
+import sys
+import operator
+from itertools import islice
+
+# 로그 분석 보고서(Markdown) 작성 엔진.
+# 기존 create_report는 문장마다 file.write를 호출하고 사고 로그 한 행마다 f-string을 새로 만든다.
+# 사고 로그가 수십만 행이 되면 분석보다 보고서 작성이 더 오래 걸리기 때문에,
+# 보고서 틀(템플릿)은 모듈을 불러올 때 한 번만 만들어 두고 표의 행은 여러 개를 묶어서 한 번에 만든 뒤
+# 큰 버퍼로 모아서 쓴다. 출력 파일 이름을 '-'로 주면 표준 출력(파이프)으로 내보낸다.
+
+# 보고서 머리말 (표의 제목 줄까지)
+REPORT_HEADER = (
+    '# 로그 분석 보고서\n\n'
+    '## 개요\n'
+    '이 보고서는 2023년 8월 27일 임무 중 발생한 로그를 분석한 결과입니다. '
+    '임무는 성공적으로 마무리하였으나, 산소 탱크에서 문제가 발생한 것으로 확인됩니다. \n\n'
+    '## 세부 사항 \n'
+    '로그에서 사고는 임무가 완료된 후 발생한 것으로 나타났습니다.\n'
+    '다음은 산소 탱크와 관련된 이벤트입니다:\n\n'
+    '| 타임스탬프 | 이벤트 | 메시지 |\n'
+    '|-----------|-------|---------|\n'
+)
+
+# 표의 한 행: '| {timestamp} | {event} | {message} |'
+# str.format은 호출할 때마다 템플릿을 다시 해석하므로, 템플릿을 '열 이름 + 구분자'로 한 번만 풀어 두고
+# 여러 행을 join 한 번으로 이어 붙인다.
+ROW_FIELDS = ('timestamp', 'event', 'message')
+ROW_PREFIX = '| '
+CELL_SEPARATOR = ' | '
+ROW_SEPARATOR = ' |\n| '
+ROW_SUFFIX = ' |\n'
+row_values = operator.itemgetter(*ROW_FIELDS)
+join_cells = CELL_SEPARATOR.join
+
+CAUSE_TEMPLATE = '\n## 원인 분석\n사고의 원인은 다음과 같을 가능성이 있습니다: **{}**.\n'
+NO_CAUSE_TEXT = '\n## 원인 분석\n로그에서 사고의 명확한 원인을 찾을 수 없었습니다.\n'
+CONCLUSION_TEXT = (
+    '\n## 결론\n'
+    '임무는 성공적으로 완료되었지만, 산소 탱크의 폭발로 센터와 임무 통제 시스템의 전원이 꺼졌습니다.\n'
+    '추후에 사고를 방지하기 위해 추가적인 조사가 필요합니다.\n'
+)
+
+# 파일 버퍼 크기(1MB)와 한 번에 만드는 표의 행 수
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_BATCH_SIZE = 4096
+
+
+def render_row(log):
+    return ROW_PREFIX + CELL_SEPARATOR.join(map(str, row_values(log))) + ROW_SUFFIX
+
+
+# 여러 행을 문자열 하나로 만든다. 행마다 write나 포맷팅을 하지 않기 때문에 빠름
+def render_rows(logs):
+    if not logs:
+        return ''
+    try:
+        return ROW_PREFIX + ROW_SEPARATOR.join(map(join_cells, map(row_values, logs))) + ROW_SUFFIX
+    except TypeError:
+        # 열이 모자라서 값이 None인 행 등이 섞여 있으면 한 행씩 문자열로 바꿔서 만듦
+        return ''.join(map(render_row, logs))
+
+
+# 원인 분석 + 결론 부분
+def render_footer(accident_cause):
+    if accident_cause:
+        return CAUSE_TEMPLATE.format(accident_cause) + CONCLUSION_TEXT
+    return NO_CAUSE_TEXT + CONCLUSION_TEXT
+
+
+# 표준 출력을 받는 쪽(예: head)이 먼저 끝나 파이프가 닫힌 경우.
+# 남은 출력이 종료 시 다시 BrokenPipeError를 내지 않도록 표준 출력을 devnull로 돌리고 조용히 종료함
+def exit_on_broken_pipe():
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(1)
+
+
+class MarkdownReportWriter:
+    def __init__(self, output_file, buffer_size=DEFAULT_BUFFER_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        # '-' 이면 표준 출력으로 내보냄 (닫지 않음)
+        if output_file == '-':
+            self.file = sys.stdout.buffer
+            self.close_file = False
+        else:
+            self.file = open(output_file, 'wb', buffering=buffer_size)
+            self.close_file = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write(self, data):
+        try:
+            self.file.write(data)
+        except BrokenPipeError:
+            if self.close_file:
+                raise
+            exit_on_broken_pipe()
+
+    def write_header(self):
+        self._write(REPORT_HEADER.encode('utf-8'))
+
+    # 보고서의 머리말, 구역 제목처럼 정해진 문장을 그대로 씀
+    def write_text(self, text):
+        self._write(text.encode('utf-8'))
+
+    # rows는 리스트나 제너레이터 모두 가능. batch_size개씩 묶어서 문자열 하나로 만든 뒤 한 번에 씀
+    # 반환값: 쓴 행의 수
+    def write_rows(self, rows):
+        count = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self._write(render_rows(batch).encode('utf-8'))
+            count += len(batch)
+        return count
+
+    def write_footer(self, accident_cause):
+        self._write(render_footer(accident_cause).encode('utf-8'))
+
+    def close(self):
+        if self.close_file:
+            self.file.close()
+        else:
+            try:
+                self.file.flush()
+            except BrokenPipeError:
+                exit_on_broken_pipe()
+
+
+# create_report와 같은 보고서를 엔진으로 작성하는 함수
+def render_report(accident_logs, accident_cause, output_file):
+    with MarkdownReportWriter(output_file) as report:
+        report.write_header()
+        report.write_rows(accident_logs)
+        report.write_footer(accident_cause)
@@ -0,0 +1,117 @@
+import os
+import heapq
+import tempfile
+from itertools import islice
+from operator import itemgetter
+
+from inventory_columnar import iter_inventory_csv, parse_inventory_line
+
+# 메모리보다 큰 재고 목록을 인화성 순으로 정렬하는 외부 정렬(external merge sort) 모듈.
+# sort_by_flammability는 목록 전체를 메모리에 올린 뒤 sorted()를 호출하기 때문에
+# 재고가 메모리보다 커지면 프로세스가 죽는다.
+# 여기서는 CSV를 한 행씩 읽으면서 메모리 예산만큼 모인 행(run)을 정렬해 임시 파일에 쓰고,
+# 마지막에 임시 파일들을 heapq.merge로 합치면서 결과 CSV를 쓴다.
+# 메모리에는 run 하나 또는 각 임시 파일의 읽기 버퍼만 올라간다.
+
+# 메모리 예산 기본값 (바이트)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# 한 행을 [문자열 4개, 실수] 리스트로 들고 있을 때 글자 외에 드는 대략적인 메모리 (리스트 + 객체 헤더)
+ROW_OVERHEAD = 360
+# 한 번에 합치는 임시 파일 수의 최대값. 이보다 많으면 몇 개씩 먼저 합쳐서 임시 파일 수를 줄임
+MAX_FAN_IN = 64
+# 임시 파일을 읽을 때 쓰는 버퍼의 최소 크기
+MIN_BUFFER_SIZE = 64 * 1024
+
+CSV_HEADER = 'Substance,Weight (g),Specific Gravity,Strength,Flammability\n'
+
+flammability_key = itemgetter(4)
+
+
+def format_row(item):
+    return ','.join(map(str, item)) + '\n'
+
+
+# 행들을 인화성 내림차순으로 정렬해서 임시 파일에 씀. 값이 같으면 원래 순서를 유지함 (sorted와 동일)
+def write_run(rows, temp_dir):
+    rows.sort(key=flammability_key, reverse=True)
+    fd, run_file = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with open(fd, 'w', encoding='utf-8') as file:
+        file.writelines(map(format_row, rows))
+    return run_file
+
+
+# 임시 파일의 행을 하나씩 돌려줌
+def iter_run(run_file, buffer_size):
+    with open(run_file, 'r', encoding='utf-8', buffering=buffer_size) as file:
+        for line in file:
+            yield parse_inventory_line(line)
+
+
+# 행들을 메모리 예산 크기의 run으로 나누어 정렬하고 임시 파일 목록을 반환
+def split_runs(rows, temp_dir, memory_budget, threshold=None):
+    run_files = []
+    run = []
+    run_size = 0
+    for item in rows:
+        if threshold is not None and item[4] < threshold:
+            continue  # 기준값 미만은 정렬할 필요가 없으므로 임시 파일에 쓰지 않음
+        run.append(item)
+        run_size += ROW_OVERHEAD + len(item[0]) + len(item[1]) + len(item[2]) + len(item[3])
+        if run_size >= memory_budget:
+            run_files.append(write_run(run, temp_dir))
+            run = []
+            run_size = 0
+    if run or not run_files:
+        run_files.append(write_run(run, temp_dir))
+    return run_files
+
+
+# 여러 run을 합친 행들. 앞쪽 run의 행이 먼저 나오므로 같은 인화성끼리는 원래 순서가 유지됨
+def merge_runs(run_files, buffer_size):
+    return heapq.merge(*[iter_run(run_file, buffer_size) for run_file in run_files],
+                       key=flammability_key, reverse=True)
+
+
+# 임시 파일이 fan_in개보다 많으면 이웃한 fan_in개씩 먼저 합쳐서 개수를 줄임
+def reduce_runs(run_files, temp_dir, fan_in, buffer_size):
+    while len(run_files) > fan_in:
+        merged_files = []
+        for start in range(0, len(run_files), fan_in):
+            group = run_files[start:start + fan_in]
+            if len(group) == 1:
+                merged_files.append(group[0])
+                continue
+            fd, merged_file = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+            with open(fd, 'w', encoding='utf-8') as file:
+                file.writelines(map(format_row, merge_runs(group, buffer_size)))
+            for run_file in group:
+                os.remove(run_file)
+            merged_files.append(merged_file)
+        run_files = merged_files
+    return run_files
+
+
+# CSV를 외부 정렬해서 인화성이 높은 순으로 output_file에 씀.
+# threshold가 있으면 그 이상인 행만 씀 (filter_high_flammability(sort_by_flammability(...))와 같은 결과)
+# 반환값: 결과 CSV에 쓴 행 수
+def external_sort_csv(input_file, output_file, memory_budget=DEFAULT_MEMORY_BUDGET, threshold=None,
+                      fan_in=MAX_FAN_IN, temp_dir=None):
+    if fan_in < 2:
+        raise ValueError('fan_in must be at least 2')
+    with tempfile.TemporaryDirectory(prefix='inventory_sort_', dir=temp_dir) as work_dir:
+        run_files = split_runs(iter_inventory_csv(input_file), work_dir, memory_budget, threshold)
+        # 합치는 동안에는 열린 임시 파일들의 읽기 버퍼가 메모리 예산을 나누어 씀
+        buffer_size = max(memory_budget // (min(len(run_files), fan_in) + 1), MIN_BUFFER_SIZE)
+        run_files = reduce_runs(run_files, work_dir, fan_in, buffer_size)
+
+        row_count = 0
+        with open(output_file, 'w', encoding='utf-8', buffering=buffer_size) as file:
+            file.write(CSV_HEADER)
+            merged = merge_runs(run_files, buffer_size)
+            while True:
+                chunk = list(islice(merged, 4096))
+                if not chunk:
+                    break
+                file.writelines(map(format_row, chunk))
+                row_count += len(chunk)
+    return row_count
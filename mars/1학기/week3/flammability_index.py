@@ -0,0 +1,218 @@
+import os
+import sys
+import mmap
+import bisect
+import struct
+import hashlib
+import argparse
+from array import array
+
+from inventory_columnar import parse_inventory_line
+
+# 인화성 색인: CSV 옆에 '인화성이 높은 순으로 정렬된 (인화성, 행의 위치)' 목록을 파일로 저장해 둔다.
+# filter_high_flammability는 호출할 때마다 전체 목록을 훑고, 스크립트는 실행할 때마다 다시 정렬하지만
+# 색인이 있으면 "인화성이 t 이상인 물질"을 이분 탐색 한 번으로 찾을 수 있다.
+# 대시보드처럼 기준값을 여러 번 바꿔 가며 조회해도 조회마다 O(log n)만 든다.
+# CSV 뒤에 행이 추가되면 추가된 행만 읽어서 색인에 합치고, 그 외의 변경은 처음부터 다시 만든다.
+# 뒤에 행만 추가되었는지는 CSV 크기와 색인한 부분의 처음과 마지막 CHECK_SIZE바이트의 해시로 판단한다.
+#   - 크기가 늘지 않았는데 수정 시각이 바뀌었으면 (같은 크기로 고친 경우 포함) 항상 다시 만든다.
+#   - 크기가 늘었으면 처음/마지막 블록만 확인하므로 비용이 CSV 크기와 상관없이 일정하다.
+#     (행을 추가하면서 중간 행도 함께 고친 경우는 알아채지 못하므로 그때는 색인 파일을 지우면 다시 만들어짐)
+#
+# 색인 파일 형식 (little endian):
+#   헤더(56바이트): magic 'FLIDX003' | CSV 크기(8) | 색인한 위치(8) | CSV 수정 시각(ns, 8) | 항목 수(8)
+#                   | 색인한 부분의 처음과 마지막 CHECK_SIZE바이트의 해시(16)
+#   -인화성(8바이트 실수) x 항목 수   : 오름차순 (= 인화성 내림차순), 같으면 CSV 순서
+#   행의 시작 위치(8바이트 정수) x 항목 수
+
+MAGIC = b'FLIDX003'
+HEADER_FORMAT = '<8sQQqQ16s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+# 뒤에 행만 추가되었는지 확인할 때 해시를 구하는 블록 크기
+CHECK_SIZE = 4096
+
+
+def index_path_for(csv_file):
+    return csv_file + '.flidx'
+
+
+# CSV의 [0, end) 구간 중 처음과 마지막 CHECK_SIZE바이트의 해시. 구간 길이와 상관없이 최대 8KB만 읽음
+def edge_hash(file, end):
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(end.to_bytes(8, 'little'))
+    file.seek(0)
+    hasher.update(file.read(min(CHECK_SIZE, end)))
+    tail_start = max(end - CHECK_SIZE, CHECK_SIZE)
+    if tail_start < end:
+        file.seek(tail_start)
+        hasher.update(file.read(end - tail_start))
+    return hasher.digest()
+
+
+def read_header(index_file):
+    try:
+        with open(index_file, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+        return None
+    _, file_size, indexed_size, mtime_ns, count, check = struct.unpack(HEADER_FORMAT, header)
+    return {'file_size': file_size, 'indexed_size': indexed_size, 'mtime_ns': mtime_ns,
+            'count': count, 'check': check}
+
+
+# CSV의 start 위치부터 끝까지 읽어 (-인화성, 행의 위치) 목록과 읽은 끝 위치를 반환
+def scan_entries(file, start):
+    entries = []
+    file.seek(start)
+    position = start
+    if start == 0:
+        position += len(file.readline())  # 첫 번째 줄은 헤더로 제외
+    for line in iter(file.readline, b''):
+        parts = parse_inventory_line(line.decode('utf-8'))
+        if parts is None:
+            print(f"Warning: Line has an incorrect number of columns: {line.decode('utf-8')}")
+        else:
+            entries.append((-parts[4], position))
+        position += len(line)
+    return entries, position
+
+
+def load_entries(index_file, count):
+    with open(index_file, 'rb') as file:
+        file.seek(HEADER_SIZE)
+        keys = array('d')
+        keys.fromfile(file, count)
+        offsets = array('Q')
+        offsets.fromfile(file, count)
+    return keys, offsets
+
+
+# 정렬된 색인(keys, offsets)에 새 항목을 끼워 넣은 새 배열을 만듦.
+# 기존 항목은 파이썬 객체로 바꾸지 않고 배열 조각(slice) 단위로 복사하므로 새 항목 수만큼만 파이썬 연산을 함.
+# 새 항목은 기존 행보다 CSV 뒤쪽이므로, 인화성이 같으면 기존 항목 뒤(bisect_right)에 들어감
+def splice_entries(keys, offsets, new_entries):
+    new_entries.sort()
+    merged_keys = array('d')
+    merged_offsets = array('Q')
+    previous = 0
+    for key, offset in new_entries:
+        position = bisect.bisect_right(keys, key, previous)
+        merged_keys.extend(keys[previous:position])
+        merged_offsets.extend(offsets[previous:position])
+        merged_keys.append(key)
+        merged_offsets.append(offset)
+        previous = position
+    merged_keys.extend(keys[previous:])
+    merged_offsets.extend(offsets[previous:])
+    return merged_keys, merged_offsets
+
+
+def write_index(index_file, csv_stat, indexed_size, check, keys, offsets):
+    temp_file = index_file + '.tmp'
+    with open(temp_file, 'wb') as file:
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, csv_stat.st_size, indexed_size, csv_stat.st_mtime_ns,
+                               len(keys), check))
+        keys.tofile(file)
+        offsets.tofile(file)
+    os.replace(temp_file, index_file)
+
+
+# 색인을 최신 상태로 만듦.
+# 반환값: 'fresh'(그대로 사용), 'appended'(추가된 행만 반영), 'rebuilt'(처음부터 다시 만듦)
+def update_index(csv_file, index_file=None):
+    if index_file is None:
+        index_file = index_path_for(csv_file)
+    csv_stat = os.stat(csv_file)
+    header = read_header(index_file)
+    if header and header['file_size'] == csv_stat.st_size and header['mtime_ns'] == csv_stat.st_mtime_ns:
+        return 'fresh'
+
+    with open(csv_file, 'rb') as file:
+        # CSV가 커졌고 색인한 부분의 처음과 끝이 그대로이면 뒤에 행만 추가된 것으로 보고 추가된 부분만 읽어서 합침
+        if (header and header['indexed_size'] < csv_stat.st_size
+                and edge_hash(file, header['indexed_size']) == header['check']):
+            new_entries, indexed_size = scan_entries(file, header['indexed_size'])
+            keys, offsets = load_entries(index_file, header['count'])
+            keys, offsets = splice_entries(keys, offsets, new_entries)
+            status = 'appended'
+        else:
+            entries, indexed_size = scan_entries(file, 0)
+            entries.sort()
+            keys = array('d', [key for key, _ in entries])
+            offsets = array('Q', [offset for _, offset in entries])
+            status = 'rebuilt'
+        check = edge_hash(file, indexed_size)
+
+    write_index(index_file, csv_stat, indexed_size, check, keys, offsets)
+    return status
+
+
+class FlammabilityIndex:
+    def __init__(self, csv_file, index_file=None):
+        if sys.byteorder != 'little':
+            raise RuntimeError('FlammabilityIndex는 little endian 환경에서만 사용할 수 있습니다.')
+        self.csv_file = csv_file
+        self.index_file = index_file or index_path_for(csv_file)
+        update_index(csv_file, self.index_file)
+        self.count = read_header(self.index_file)['count']
+        self.file = open(self.index_file, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        # 메모리 맵 위에서 바로 이분 탐색 (파일 전체를 읽지 않음)
+        data = memoryview(self.mm)
+        self.keys = data[HEADER_SIZE:HEADER_SIZE + self.count * 8].cast('d')
+        self.offsets = data[HEADER_SIZE + self.count * 8:HEADER_SIZE + self.count * 16].cast('Q')
+        data.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.keys.release()
+        self.offsets.release()
+        self.mm.close()
+        self.file.close()
+
+    # 인화성이 threshold 이상인 물질의 수
+    def count_at_least(self, threshold):
+        return bisect.bisect_right(self.keys, -threshold)
+
+    # 인화성이 threshold 이상인 물질의 CSV 행 위치 (인화성이 높은 순)
+    def offsets_at_least(self, threshold):
+        return self.offsets[:self.count_at_least(threshold)].tolist()
+
+    # 인화성이 threshold 이상인 물질 목록. read_csv_to_list + sort + filter와 같은 결과
+    def items_at_least(self, threshold):
+        items = []
+        with open(self.csv_file, 'rb') as file:
+            for offset in self.offsets_at_least(threshold):
+                file.seek(offset)
+                items.append(parse_inventory_line(file.readline().decode('utf-8')))
+        return items
+
+
+def main(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='인화성 색인으로 기준값 이상의 물질을 조회')
+    parser.add_argument('thresholds', nargs='+', type=float, help='인화성 기준값 (여러 개 가능)')
+    parser.add_argument('--csv', default=os.path.join(script_dir, 'Mars_Base_Inventory_List.csv'), help='재고 CSV 경로')
+    parser.add_argument('--count', action='store_true', help='물질 목록 대신 개수만 출력')
+    args = parser.parse_args(argv)
+
+    try:
+        with FlammabilityIndex(args.csv) as index:
+            for threshold in args.thresholds:
+                print(f'인화성 {threshold} 이상: {index.count_at_least(threshold)}개')
+                if not args.count:
+                    for item in index.items_at_least(threshold):
+                        print(item)
+    except (FileNotFoundError, PermissionError, OSError, UnicodeDecodeError) as e:
+        print(f"File error: {e}")
+
+
+if __name__ == '__main__':
+    main()
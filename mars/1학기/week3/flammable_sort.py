@@ -1,3 +1,11 @@
+import os
+import heapq
+import argparse
+
+from external_sort import DEFAULT_MEMORY_BUDGET, external_sort_csv
+from inventory_binary import InventoryBinary, write_inventory_binary
+from inventory_columnar import ColumnarInventory, iter_inventory_csv, read_csv_to_columns
+
 def read_csv_to_list(filename):
     try:
         inventory_list = []
@@ -24,6 +32,9 @@ def read_csv_to_list(filename):
         return []
 
 def sort_by_flammability(inventory_list):
+    # 열 단위 저장소(ColumnarInventory)는 인화성 배열을 직접 정렬함
+    if isinstance(inventory_list, ColumnarInventory):
+        return inventory_list.sort_by_flammability()
     try: # 
         return sorted(inventory_list, key=lambda x: x[4], reverse=True)
     except (IndexError, TypeError) as e:
@@ -31,6 +42,8 @@ def sort_by_flammability(inventory_list):
         return []
 
 def filter_high_flammability(inventory_list, threshold=0.7):
+    if isinstance(inventory_list, ColumnarInventory):
+        return inventory_list.filter_high_flammability(threshold)
     try:
         return [item for item in inventory_list if item[4] >= threshold]
     except (IndexError, TypeError) as e:
@@ -46,54 +59,114 @@ def write_csv(filename, inventory_list):
     except OSError as e: 
         print(f"File error when writing CSV: {e}")
 
-# elem 은 리스트 안에 있는 요소들.
+# 스트리밍 파이프라인: CSV 행 -> 기준값 필터 -> 상위 K개 -> write_csv
+# 목록 전체를 읽어 정렬하지 않고 한 번만 훑으며, 메모리에는 상위 K개만 남는다.
+def filter_rows(rows, threshold=0.7):
+    for item in rows:
+        if item[4] >= threshold:
+            yield item
+
+# 인화성이 높은 K개. heapq.nlargest는 sorted(..., reverse=True)[:k]와 같은 결과(같은 값은 원래 순서)를 돌려줌
+def top_k_rows(rows, k):
+    return heapq.nlargest(k, rows, key=lambda x: x[4])
+
+def stream_top_flammable(filename, k, threshold=0.7):
+    return top_k_rows(filter_rows(iter_inventory_csv(filename), threshold), k)
+
+# 이진 파일은 inventory_binary의 형식(헤더 + 문자열 테이블 + 고정 길이 레코드)으로 저장함.
+# 예전처럼 글자를 이어 붙이기만 하면 다시 읽을 때 행과 칸을 나눌 수 없기 때문.
 def write_binary(filename, inventory_list):
     try:
-        with open(filename, 'wb') as file:
-            for item in inventory_list:
-                for elem in item:
-                    try:
-                        if isinstance(elem, str):
-                            elem = elem.encode()  # 문자열을 바이트로 변환
-                        file.write(bytes(str(elem), 'utf-8')) # 문자열을 byte로 변환하여 파일에 작성
-                    except UnicodeEncodeError as ue:
-                        print(f"Encoding error occurred: {ue}")
+        write_inventory_binary(filename, inventory_list)
+    except UnicodeEncodeError as ue:
+        print(f"Encoding error occurred: {ue}")
     except OSError as e:
         print(f"File error when writing binary: {e}")
-# bin 파일 읽는 함수
+# bin 파일 읽는 함수. 메모리 맵으로 열어서 레코드를 한 행씩 출력
 def read_binary(filename):
     try:
-        with open(filename, 'rb') as file:
-            content = file.read()
-            print(content.decode('utf-8'))
+        with InventoryBinary(filename) as binary:
+            for item in binary:
+                print(item)
     except (FileNotFoundError, PermissionError, OSError, UnicodeDecodeError) as e:
         print(f"File error when reading binary: {e}")
+    except ValueError as ve:
+        print(f"Data error when reading binary: {ve}")
 
 # 메인 실행 코드
-inventory_file = 'E:\min-codyssey\mars\week3\Mars_Base_Inventory_List.csv'
-inventory_list = read_csv_to_list(inventory_file)
+def main(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='화성 기지 재고 목록을 인화성 순으로 정렬하고 위험 물질을 골라냄')
+    parser.add_argument('--csv', default=os.path.join(script_dir, 'Mars_Base_Inventory_List.csv'), help='재고 CSV 경로')
+    parser.add_argument('--external', action='store_true',
+                        help='메모리보다 큰 재고 목록을 임시 파일로 나누어 정렬 (위험 물질 CSV만 작성)')
+    parser.add_argument('--memory-budget', type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+                        help='외부 정렬에서 사용할 메모리 예산 (MB)')
+    parser.add_argument('--temp-dir', default=None, help='외부 정렬의 임시 파일을 둘 디렉토리')
+    parser.add_argument('--threshold', type=float, default=0.7, help='위험 물질로 볼 인화성 기준값')
+    parser.add_argument('--top', type=int, default=None,
+                        help='인화성이 높은 K개만 한 번에 훑어서 골라냄 (전체 정렬 없이 K개만 메모리에 유지)')
+    args = parser.parse_args(argv)
+    inventory_file = args.csv
+    threshold = args.threshold
+
+    if args.top is not None:
+        # 인화성 기준값 이상인 물질 중 상위 K개만 골라서 CSV로 저장
+        try:
+            dangerous_inventory = stream_top_flammable(inventory_file, args.top, threshold)
+        except (FileNotFoundError, PermissionError, OSError, UnicodeDecodeError) as e:
+            print(f"File error: {e}")
+            return
+        except ValueError as ve:
+            print(f"Data error: {ve}")
+            return
+        write_csv('Mars_Base_Inventory_danger.csv', dangerous_inventory)
+        print(f"인화성 지수가 {threshold} 이상인 물질 중 상위 {args.top}개:")
+        for item in dangerous_inventory:
+            print(item)
+        return
+
+    if args.external:
+        # 목록 전체를 메모리에 올리지 않고 정렬하면서 인화성 기준값 이상인 목록을 CSV로 저장
+        try:
+            row_count = external_sort_csv(inventory_file, 'Mars_Base_Inventory_danger.csv',
+                                          memory_budget=args.memory_budget * 1024 * 1024,
+                                          threshold=threshold, temp_dir=args.temp_dir)
+            print(f"인화성 지수가 {threshold} 이상인 물질 {row_count}개를 Mars_Base_Inventory_danger.csv에 저장했습니다.")
+        except (FileNotFoundError, PermissionError, OSError, UnicodeDecodeError) as e:
+            print(f"File error: {e}")
+        except ValueError as ve:
+            print(f"Data error: {ve}")
+        return
+
+    # 열 단위 저장소로 읽어서 정렬/필터가 배열을 직접 사용하도록 함 (read_csv_to_list와 결과는 같음)
+    inventory_list = read_csv_to_columns(inventory_file)
+
+    if inventory_list:
+        # CSV 파일에서 읽은 내용 출력
+        print("CSV 파일에서 읽은 내용:")
+        for item in inventory_list:
+            print(item)
+
+        # 인화성 순으로 정렬
+        sorted_inventory = sort_by_flammability(inventory_list)
 
-if inventory_list:
-    # CSV 파일에서 읽은 내용 출력
-    print("CSV 파일에서 읽은 내용:")
-    for item in inventory_list:
-        print(item)
+        # 인화성이 기준값(--threshold, 기본 0.7) 이상인 목록 필터링
+        dangerous_inventory = filter_high_flammability(sorted_inventory, threshold)
 
-    # 인화성 순으로 정렬
-    sorted_inventory = sort_by_flammability(inventory_list)
+        # 인화성이 기준값 이상인 목록 CSV로 저장
+        write_csv('Mars_Base_Inventory_danger.csv', dangerous_inventory)
 
-    # 인화성 0.7 이상인 목록 필터링
-    dangerous_inventory = filter_high_flammability(sorted_inventory)
+        # 인화성이 기준값 이상인 목록 출력
+        print(f"인화성 지수가 {threshold} 이상인 물질 목록:")
+        for item in dangerous_inventory:
+            print(item)
 
-    # 인화성 0.7 이상인 목록 CSV로 저장
-    write_csv('Mars_Base_Inventory_danger.csv', dangerous_inventory)
+        # 이진 파일로 저장 및 출력
+        print('이진파일 출력')
+        write_binary('Mars_Base_Inventory_List.bin', sorted_inventory)
+        read_binary('Mars_Base_Inventory_List.bin')
 
-    # 인화성 0.7 이상인 목록 출력
-    print("인화성 지수가 0.7 이상인 물질 목록:")
-    for item in dangerous_inventory:
-        print(item)
 
-    # 이진 파일로 저장 및 출력
-    print('이진파일 출력')
-    write_binary('Mars_Base_Inventory_List.bin', sorted_inventory)
-    read_binary('Mars_Base_Inventory_List.bin')
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import sys
+import mmap
+import struct
+from array import array
+from itertools import compress
+
+from inventory_columnar import ColumnarInventory, parse_number, pick
+
+# 화성 기지 재고 목록의 이진 파일 형식.
+# 예전 write_binary는 각 칸의 글자를 구분자 없이 이어 붙였기 때문에 다시 읽어도 행을 나눌 수 없었다.
+# 새 형식은 헤더 / 문자열 색인 / 문자열 데이터 / 고정 길이 레코드로 이루어져 있어서
+# 메모리 맵으로 연 뒤 필요한 행만 바로 읽을 수 있고, 전체를 읽을 때도 CSV를 다시 파싱하는 것보다 훨씬 빠르다.
+#
+# 파일 구조 (little endian):
+#   헤더(48바이트): magic 'MINV' | 버전(2) | 레코드 크기(2) | 레코드 수(8) | 문자열 수(8)
+#                   | 문자열 색인 위치(8) | 문자열 데이터 위치(8) | 레코드 위치(8)
+#   문자열 색인: 문자열마다 (데이터 안에서의 위치 4바이트, 길이 4바이트)
+#   문자열 데이터: UTF-8로 이어 붙인 문자열 (물질 이름, Strength, 숫자가 아닌 무게/비중 글자)
+#   레코드: 행마다 40바이트, 8바이트 경계에 맞춰 시작
+#           물질 이름 번호(4) | Strength 번호(4) | 무게 글자 번호(4) | 비중 글자 번호(4)
+#           | 무게(8, 실수) | 비중(8, 실수) | 인화성(8, 실수)
+#   무게/비중 글자 번호가 NO_TEXT이면 실수 값을 str()로 바꾼 글자가 원래 글자와 같다는 뜻
+
+MAGIC = b'MINV'
+VERSION = 1
+HEADER_FORMAT = '<4sHHQQQQQ'
+STRING_INDEX_FORMAT = '<II'
+RECORD_FORMAT = '<IIIIddd'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+STRING_INDEX_SIZE = struct.calcsize(STRING_INDEX_FORMAT)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+NO_TEXT = 0xFFFFFFFF
+
+
+def align8(offset):
+    return (offset + 7) // 8 * 8
+
+
+# 재고 목록(리스트 또는 ColumnarInventory)을 새 이진 형식으로 저장
+def write_inventory_binary(filename, inventory_list):
+    string_ids = {}
+    strings = []
+
+    def string_id(text):
+        sid = string_ids.get(text)
+        if sid is None:
+            sid = len(strings)
+            string_ids[text] = sid
+            strings.append(text)
+        return sid
+
+    records = []
+    for item in inventory_list:
+        weight, keep_weight = parse_number(item[1])
+        gravity, keep_gravity = parse_number(item[2])
+        records.append(struct.pack(
+            RECORD_FORMAT,
+            string_id(item[0]),
+            string_id(item[3]),
+            string_id(item[1]) if keep_weight else NO_TEXT,
+            string_id(item[2]) if keep_gravity else NO_TEXT,
+            weight,
+            gravity,
+            float(item[4]),
+        ))
+
+    encoded = [text.encode('utf-8') for text in strings]
+    string_index = []
+    position = 0
+    for data in encoded:
+        string_index.append(struct.pack(STRING_INDEX_FORMAT, position, len(data)))
+        position += len(data)
+
+    string_index_offset = HEADER_SIZE
+    string_data_offset = string_index_offset + len(encoded) * STRING_INDEX_SIZE
+    records_offset = align8(string_data_offset + position)
+
+    with open(filename, 'wb') as file:
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, RECORD_SIZE, len(records), len(strings),
+                               string_index_offset, string_data_offset, records_offset))
+        file.write(b''.join(string_index))
+        file.write(b''.join(encoded))
+        file.write(b'\0' * (records_offset - string_data_offset - position))
+        file.write(b''.join(records))
+
+
+class InventoryBinary:
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 메모리 맵으로 열 수 없음
+            self.file.close()
+            raise ValueError(f"'{filename}' is not an inventory binary file.")
+        header = self.mm[:HEADER_SIZE]
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"'{filename}' is not an inventory binary file.")
+        (_, version, record_size, self.record_count, self.string_count,
+         self.string_index_offset, self.string_data_offset, self.records_offset) = struct.unpack(HEADER_FORMAT, header)
+        if version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"Unsupported inventory binary version: {version}")
+        self._strings = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.record_count
+
+    # 문자열 번호로 문자열을 읽음. 한 번 읽은 문자열은 기억해 둠
+    def string(self, sid):
+        text = self._strings.get(sid)
+        if text is None:
+            offset = self.string_index_offset + sid * STRING_INDEX_SIZE
+            position, length = struct.unpack_from(STRING_INDEX_FORMAT, self.mm, offset)
+            start = self.string_data_offset + position
+            text = self.mm[start:start + length].decode('utf-8')
+            self._strings[sid] = text
+        return text
+
+    # i번째 행만 읽어서 read_csv_to_list와 같은 형식으로 반환 (파일 전체를 읽지 않음)
+    def row(self, i):
+        if not 0 <= i < self.record_count:
+            raise IndexError('inventory record index out of range')
+        substance_id, strength_id, weight_id, gravity_id, weight, gravity, flammability = struct.unpack_from(
+            RECORD_FORMAT, self.mm, self.records_offset + i * RECORD_SIZE)
+        return [
+            self.string(substance_id),
+            self.string(weight_id) if weight_id != NO_TEXT else str(weight),
+            self.string(gravity_id) if gravity_id != NO_TEXT else str(gravity),
+            self.string(strength_id),
+            flammability,
+        ]
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+    def __iter__(self):
+        for i in range(self.record_count):
+            yield self.row(i)
+
+    # 모든 레코드를 ColumnarInventory로 불러옴.
+    # 레코드 영역을 4바이트/8바이트 배열로 보고 열마다 한 칸씩 건너뛰며(slice) 꺼내기 때문에 파이썬 반복문이 거의 없음
+    def to_columnar(self):
+        inventory = ColumnarInventory()
+        strings = [self.string(sid) for sid in range(self.string_count)]
+        end = self.records_offset + self.record_count * RECORD_SIZE
+        records = memoryview(self.mm)[self.records_offset:end]
+        try:
+            if sys.byteorder == 'little':
+                ints = records.cast('I')
+                doubles = records.cast('d')
+                int_step = RECORD_SIZE // 4
+                double_step = RECORD_SIZE // 8
+                substance_ids = ints[0::int_step].tolist()
+                strength_ids = ints[1::int_step].tolist()
+                weight_ids = ints[2::int_step].tolist()
+                gravity_ids = ints[3::int_step].tolist()
+                inventory.weight = array('d', doubles[2::double_step].tolist())
+                inventory.specific_gravity = array('d', doubles[3::double_step].tolist())
+                inventory.flammability = array('d', doubles[4::double_step].tolist())
+            else:
+                columns = list(zip(*struct.iter_unpack(RECORD_FORMAT, records))) or [()] * 7
+                substance_ids, strength_ids, weight_ids, gravity_ids = columns[:4]
+                inventory.weight = array('d', columns[4])
+                inventory.specific_gravity = array('d', columns[5])
+                inventory.flammability = array('d', columns[6])
+        finally:
+            records.release()
+
+        inventory.substance = list(pick(strings, substance_ids))
+        # Strength 번호로 문자열 번호를 그대로 사용
+        inventory.strength_values = strings
+        inventory.strength_codes = array('I', strength_ids)
+        inventory._strength_lookup = {text: sid for sid, text in enumerate(strings)}
+        for i in compress(range(self.record_count), map(NO_TEXT.__ne__, weight_ids)):
+            inventory.weight_text[i] = strings[weight_ids[i]]
+        for i in compress(range(self.record_count), map(NO_TEXT.__ne__, gravity_ids)):
+            inventory.specific_gravity_text[i] = strings[gravity_ids[i]]
+        return inventory
+
+
+# 이진 파일 전체를 ColumnarInventory로 읽음
+def read_inventory_binary(filename):
+    with InventoryBinary(filename) as binary:
+        return binary.to_columnar()
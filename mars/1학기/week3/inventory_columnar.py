@@ -0,0 +1,190 @@
+import sys
+import math
+from array import array
+from itertools import compress
+from operator import itemgetter
+
+# 화성 기지 재고 목록을 열(column) 단위로 저장하는 모듈.
+# read_csv_to_list는 한 행을 [문자열, 문자열, 문자열, 문자열, 실수] 리스트로 저장하기 때문에
+# 재고가 수백만 개가 되면 행마다 리스트와 문자열 객체가 생겨 메모리를 많이 쓴다.
+# 숫자 열은 array('d')에 실수로 모아 두고, 물질 이름은 sys.intern으로 같은 문자열을 공유하며,
+# Strength처럼 값의 종류가 적은 열은 번호(코드)로 저장해서 메모리를 몇 배 줄인다.
+# 정렬과 필터도 이 배열을 직접 사용하고, 결과는 열을 복사하지 않고 행 번호 배열만 가진다.
+
+# 숫자 열의 값을 실수로 바꿈. 'Various'처럼 숫자가 아니면 NaN
+# 원래 글자와 str(실수)가 다르면('Various', '1' -> '1.0' 등) 글자를 따로 보관해야 하므로 두 번째 값으로 알려줌
+def parse_number(text):
+    try:
+        value = float(text)
+    except ValueError:
+        return math.nan, True
+    return value, str(value) != text
+
+
+# CSV 한 줄을 read_csv_to_list와 같은 규칙으로 [이름, 무게, 비중, 강도, 인화성]으로 바꿈.
+# 열 개수가 맞지 않으면 None (호출한 쪽에서 경고 출력)
+def parse_inventory_line(line):
+    parts = line.strip().split(',')
+    if len(parts) != 5:
+        return None
+    try:
+        parts[4] = float(parts[4])
+    except ValueError:
+        parts[4] = 0.0  # 인화성 값이 없으면 0.0
+    return parts
+
+
+# seq에서 indices 위치의 값만 순서대로 뽑음. itemgetter를 쓰면 파이썬 반복문 없이 C에서 처리됨
+def pick(seq, indices):
+    if not indices:
+        return []
+    if len(indices) == 1:
+        return [seq[indices[0]]]
+    return itemgetter(*indices)(seq)
+
+
+class ColumnarInventory:
+    def __init__(self):
+        self.substance = []                 # 물질 이름 (sys.intern으로 공유)
+        self.weight = array('d')            # 무게 (숫자가 아니면 NaN)
+        self.specific_gravity = array('d')  # 비중 (숫자가 아니면 NaN)
+        self.strength_codes = array('I')    # Strength 값의 번호
+        self.strength_values = []           # 번호 -> Strength 문자열
+        self.flammability = array('d')      # 인화성 (숫자가 아니면 0.0, read_csv_to_list와 동일)
+        # 숫자로 바꾸면 원래 글자가 달라지는 칸만 {행 번호: 원래 글자}로 따로 보관 (대부분 비어 있음)
+        self.weight_text = {}
+        self.specific_gravity_text = {}
+        self._strength_lookup = {}
+        # 정렬/필터 결과는 열을 복사하지 않고 원본 행 번호의 순서(order)만 가진다. None이면 원본 순서 그대로
+        self.order = None
+
+    def __len__(self):
+        if self.order is not None:
+            return len(self.order)
+        return len(self.flammability)
+
+    # 한 행을 read_csv_to_list와 같은 형식([이름, 무게, 비중, 강도, 인화성])으로 반환
+    def row(self, i):
+        if self.order is not None:
+            i = self.order[i]
+        weight_text = self.weight_text.get(i)
+        if weight_text is None:
+            weight_text = str(self.weight[i])
+        gravity_text = self.specific_gravity_text.get(i)
+        if gravity_text is None:
+            gravity_text = str(self.specific_gravity[i])
+        return [
+            self.substance[i],
+            weight_text,
+            gravity_text,
+            self.strength_values[self.strength_codes[i]],
+            self.flammability[i],
+        ]
+
+    # for item in inventory 처럼 쓸 수 있도록 행을 하나씩 돌려줌 (write_csv, write_binary에 그대로 넘길 수 있음)
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    # [이름, 무게, 비중, 강도, 인화성] 한 행을 추가. 인화성은 이미 실수로 바뀐 값을 받음
+    def append(self, parts):
+        if self.order is not None:
+            raise ValueError('정렬/필터 결과에는 행을 추가할 수 없습니다.')
+        index = len(self.flammability)
+        self.substance.append(sys.intern(parts[0]))
+
+        weight, keep_text = parse_number(parts[1])
+        self.weight.append(weight)
+        if keep_text:
+            self.weight_text[index] = sys.intern(parts[1])
+
+        gravity, keep_text = parse_number(parts[2])
+        self.specific_gravity.append(gravity)
+        if keep_text:
+            self.specific_gravity_text[index] = sys.intern(parts[2])
+
+        code = self._strength_lookup.get(parts[3])
+        if code is None:
+            code = len(self.strength_values)
+            self._strength_lookup[parts[3]] = code
+            self.strength_values.append(parts[3])
+        self.strength_codes.append(code)
+
+        self.flammability.append(parts[4])
+
+    # 같은 열을 공유하면서 행 순서만 다른 결과를 만듦
+    def _view(self, order):
+        result = ColumnarInventory()
+        result.__dict__.update(self.__dict__)
+        result.order = array('L', order)
+        return result
+
+    # 현재 순서대로의 인화성 값. 정렬 키로 쓸 때 array보다 리스트의 인덱싱이 빨라서 리스트로 꺼냄
+    def _flammability_in_order(self):
+        if self.order is None:
+            return self.flammability.tolist()
+        return pick(self.flammability, self.order)
+
+    # 인화성이 높은 순으로 정렬. 행 리스트 대신 행 번호만 정렬하고, 값이 같으면 원래 순서를 유지함 (sorted와 동일)
+    def sort_by_flammability(self):
+        values = self._flammability_in_order()
+        positions = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+        if self.order is not None:
+            positions = pick(self.order, positions)
+        return self._view(positions)
+
+    # 인화성이 threshold 이상인 행만 남김. 비교와 선택 모두 map/compress로 처리해서 파이썬 반복문이 없음
+    def filter_high_flammability(self, threshold=0.7):
+        values = self._flammability_in_order()
+        rows = range(len(values)) if self.order is None else self.order
+        # int.__le__(float)는 NotImplemented(참으로 취급됨)를 반환하므로 기준값을 float로 바꿔서 비교
+        return self._view(compress(rows, map(float(threshold).__le__, values)))
+
+    # 정렬/필터 결과를 원본과 떨어진 새 열로 복사 (원본을 버리고 결과만 남길 때 메모리를 줄이기 위함)
+    def compact(self):
+        if self.order is None:
+            return self
+        result = ColumnarInventory()
+        for row in self:
+            result.append(row)
+        return result
+
+
+# 리스트 형식의 재고 목록을 ColumnarInventory로 변환
+def from_rows(inventory_list):
+    inventory = ColumnarInventory()
+    for item in inventory_list:
+        inventory.append(item)
+    return inventory
+
+
+# read_csv_to_list와 같은 규칙으로 CSV를 한 행씩 읽어 [이름, 무게, 비중, 강도, 인화성]을 돌려주는 제너레이터.
+# 파일 전체를 메모리에 올리지 않으므로 재고 목록이 아무리 커도 사용할 수 있음
+def iter_inventory_csv(filename):
+    with open(filename, 'r', encoding='utf-8') as file:
+        file.readline()  # 첫 번째 줄은 헤더로 제외
+        line_count = 0
+        for line in file:
+            line_count += 1
+            parts = parse_inventory_line(line)
+            if parts is None:  # 열 개수 불일치
+                print(f"Warning: Line has an incorrect number of columns: {line}")
+                continue  # 비정상적인 데이터는 건너뜀
+            yield parts
+    if line_count == 0:  # 데이터가 없는 경우 예외 처리
+        raise ValueError(f"File '{filename}' does not contain enough data (header and at least one row required).")
+
+
+# read_csv_to_list와 같은 규칙으로 CSV를 읽되, 행 리스트를 만들지 않고 바로 열에 저장함
+def read_csv_to_columns(filename):
+    try:
+        inventory = ColumnarInventory()
+        for parts in iter_inventory_csv(filename):
+            inventory.append(parts)
+        return inventory
+    except (FileNotFoundError, PermissionError, OSError, UnicodeDecodeError) as e:
+        print(f"File error: {e}")
+        return ColumnarInventory()
+    except ValueError as ve:
+        print(f"Data error: {ve}")
+        return ColumnarInventory()
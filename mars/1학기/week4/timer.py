@@ -1,4 +1,7 @@
 import time
+import heapq
+import itertools
+import threading
 
 class SimpleTimer:
     def __init__(self):
@@ -22,10 +25,115 @@ class SimpleTimer:
         seconds = self.elapsed_time % 60
         print(f"로그 기록: {int(minutes)}분 {int(seconds)}초 경과")
 
+class PeriodicScheduler:
+    """여러 주기 작업을 스레드 하나로 실행하는 스케줄러
+
+    SimpleTimer처럼 작업마다 1초씩 깨어나 시간을 확인하지 않고,
+    다음 실행 시각이 가장 빠른 작업을 힙(heap)에 두고 그 시각까지만 잠든다.
+    작업이 수천 개여도 스레드는 하나이고, 작업을 추가/삭제할 때 O(log n)만 든다.
+    시스템 시각이 바뀌어도 영향을 받지 않도록 time.monotonic()을 사용한다.
+    """
+
+    def __init__(self):
+        self.heap = []  # (다음 실행 시각, 작업 번호)
+        self.jobs = {}  # 작업 번호 -> (주기, 함수, 인자)
+        self.ids = itertools.count(1)
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    def add_job(self, interval, func, *args, delay=None):
+        """interval초마다 func(*args)를 실행하도록 등록하고 작업 번호를 반환 (첫 실행은 delay초 뒤, 기본값 interval)"""
+        if interval <= 0:
+            raise ValueError("interval은 0보다 커야 합니다.")
+        with self.condition:
+            job_id = next(self.ids)
+            self.jobs[job_id] = (interval, func, args)
+            deadline = time.monotonic() + (interval if delay is None else delay)
+            heapq.heappush(self.heap, (deadline, job_id))
+            # 새 작업이 가장 빠르면 잠들어 있는 스레드를 깨워서 대기 시간을 다시 계산하게 함
+            if self.heap[0][1] == job_id:
+                self.condition.notify()
+        return job_id
+
+    def remove_job(self, job_id):
+        """작업 삭제. 힙에 남은 항목은 실행 시각이 되었을 때 건너뜀"""
+        with self.condition:
+            return self.jobs.pop(job_id, None) is not None
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def run(self):
+        """stop()이 호출될 때까지 작업을 실행 (현재 스레드에서 실행)"""
+        with self.condition:
+            self.running = True
+        self._loop()
+
+    def _loop(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    if not self.heap:
+                        self.condition.wait()
+                        continue
+                    deadline, job_id = self.heap[0]
+                    if job_id not in self.jobs:
+                        heapq.heappop(self.heap)  # 삭제된 작업
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)  # 다음 실행 시각까지만 잠듦
+                if not self.running:
+                    return
+                heapq.heappop(self.heap)
+                interval, func, args = self.jobs[job_id]
+                # 다음 실행 시각은 이전 실행 시각 + 주기 (실행 시간만큼 밀리지 않음)
+                # 너무 늦어서 한 주기 이상 지났다면 밀린 실행은 건너뛰고 지금부터 다시 셈
+                next_deadline = deadline + interval
+                now = time.monotonic()
+                if next_deadline <= now:
+                    next_deadline = now + interval
+                heapq.heappush(self.heap, (next_deadline, job_id))
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"작업 {job_id} 실행 중 오류 발생: {e}")
+
+    def start(self):
+        """별도의 스레드에서 run() 실행"""
+        # 스레드가 시작되기 전에 stop()이 호출되어도 멈추도록 running은 여기서 설정함
+        with self.condition:
+            self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+            self.thread = None
+
+
 # 예시 사용
-timer = SimpleTimer()
+if __name__ == '__main__':
+    timer = SimpleTimer()
+
+    def log_elapsed():
+        """5분마다 경과 시간을 로그로 기록하고 타이머 초기화"""
+        current_time = time.time()
+        timer.elapsed_time = current_time - timer.start_time
+        timer.log()
+        timer.start_time = current_time
 
-# 주기적으로 경과 시간을 체크하여 5분마다 로그 기록
-while True:
-    timer.check_and_log()  # 5분마다 로그 체크
-    time.sleep(1)  # 1초씩 대기
+    # 1초마다 깨어나 확인하지 않고, 5분 뒤에 한 번만 깨어나서 로그 기록
+    scheduler = PeriodicScheduler()
+    scheduler.add_job(300, log_elapsed)  # 5분(300초)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
@@ -0,0 +1,114 @@
+import asyncio
+import inspect
+import time
+
+# 여러 센서를 asyncio 이벤트 루프 하나에서 동시에 읽는 모듈.
+# get_sensor_data는 센서 여섯 개를 차례로 읽은 뒤 5초를 쉬기 때문에
+# 실제 센서처럼 읽는 데 시간이 걸리면 느린 센서 하나가 나머지를 모두 늦춘다.
+# AsyncSampler는 센서마다 작업(task)을 하나씩 만들어 각자의 주기로 읽고,
+# 정해진 시간(timeout) 안에 값이 오지 않으면 그 측정만 건너뛴다.
+# 작업은 스레드가 아니라 코루틴이므로 센서가 수백 개여도 이벤트 루프 하나로 충분하다.
+# 코루틴이 아닌 일반 함수는 이벤트 루프에서 바로 호출하면 끝날 때까지 모든 센서가 멈추므로
+# 기본적으로 스레드에서 실행한다. 아주 빨리 끝나는 함수만 blocking=False로 루프에서 바로 호출할 수 있다.
+
+
+class SensorSpec:
+    def __init__(self, name, reader, interval, timeout, blocking):
+        self.name = name
+        self.reader = reader
+        self.interval = interval
+        self.timeout = timeout
+        # 일반 함수를 스레드에서 실행할지 여부. False이면 이벤트 루프에서 바로 호출하므로 timeout이 적용되지 않음
+        self.blocking = blocking
+        self.is_coroutine = inspect.iscoroutinefunction(reader)
+        # 스레드에서 실행 중인 읽기. 시간 초과 후에도 스레드는 멈출 수 없으므로 끝날 때까지 다음 읽기를 시작하지 않음
+        self.pending = None
+        self.reads = 0
+        self.timeouts = 0
+        self.errors = 0
+
+
+class AsyncSampler:
+    def __init__(self, on_reading=None):
+        """on_reading(name, value, timestamp)는 값을 읽을 때마다 호출됨 (없으면 latest에만 저장)"""
+        self.sensors = {}
+        self.latest = {}  # 센서 이름 -> (값, 읽은 시각)
+        self.on_reading = on_reading
+        self._stop_event = None
+
+    def add_sensor(self, name, reader, interval=5.0, timeout=1.0, blocking=True):
+        """센서 등록. reader는 값을 반환하는 함수 또는 코루틴 함수
+
+        일반 함수는 스레드에서 실행되어 timeout이 적용된다. blocking=False이면 이벤트 루프에서 바로 호출한다.
+        """
+        if interval <= 0:
+            raise ValueError("interval은 0보다 커야 합니다.")
+        self.sensors[name] = SensorSpec(name, reader, interval, timeout, blocking)
+
+    async def read_once(self, sensor):
+        """센서 하나를 timeout 안에 읽음. 시간 초과나 오류이면 None"""
+        try:
+            if sensor.is_coroutine:
+                value = await asyncio.wait_for(sensor.reader(), sensor.timeout)
+            elif sensor.blocking:
+                if sensor.pending is not None and not sensor.pending.done():
+                    # 이전 읽기가 아직 스레드에서 끝나지 않음. 스레드가 계속 늘어나지 않도록 이번 측정은 건너뜀
+                    raise asyncio.TimeoutError
+                sensor.pending = asyncio.get_running_loop().run_in_executor(None, sensor.reader)
+                # shield: 시간 초과로 기다리기를 멈춰도 스레드의 결과(pending)는 취소하지 않음
+                value = await asyncio.wait_for(asyncio.shield(sensor.pending), sensor.timeout)
+            else:
+                value = sensor.reader()
+        except asyncio.TimeoutError:
+            sensor.timeouts += 1
+            print(f"⚠️ 센서 '{sensor.name}' 응답 시간 초과 ({sensor.timeout}초)")
+            return None
+        except Exception as e:
+            sensor.errors += 1
+            print(f"⚠️ 센서 '{sensor.name}' 읽기 오류: {e}")
+            return None
+        sensor.reads += 1
+        timestamp = time.time()
+        self.latest[sensor.name] = (value, timestamp)
+        if self.on_reading is not None:
+            self.on_reading(sensor.name, value, timestamp)
+        return value
+
+    async def _sample_forever(self, sensor):
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while not self._stop_event.is_set():
+            await self.read_once(sensor)
+            # 다음 측정 시각은 이전 측정 시각 + 주기. 읽기가 주기보다 오래 걸렸으면 밀린 측정은 건너뜀
+            next_time += sensor.interval
+            now = loop.time()
+            if next_time <= now:
+                next_time = now + sensor.interval
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), next_time - now)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, duration=None):
+        """모든 센서를 각자의 주기로 읽음. duration초가 지나거나 stop()이 호출되면 끝남"""
+        self._stop_event = asyncio.Event()
+        tasks = [asyncio.create_task(self._sample_forever(sensor)) for sensor in self.sensors.values()]
+        try:
+            if duration is None:
+                await self._stop_event.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._stop_event.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def summary(self):
+        """센서별 (읽은 횟수, 시간 초과 횟수, 오류 횟수)"""
+        return {name: (s.reads, s.timeouts, s.errors) for name, s in self.sensors.items()}
@@ -1,6 +1,13 @@
 import time
+import asyncio
 import random  # 센서 값을 무작위로 생성하기 위해 사용
 
+from async_sampler import AsyncSampler
+from rolling_aggregator import RollingAggregator
+from stop_signal import StopSignal
+from telemetry_bus import TelemetryBus
+from timeseries_store import TimeSeriesStore
+
 
 # DummySensor 클래스는 센서 값을 무작위로 생성하여 반환하는 역할을 함
 class DummySensor:
@@ -25,7 +32,7 @@ class DummySensor:
 
 # MissionComputer 클래스는 센서 데이터를 수집하고 출력하는 역할을 담당함
 class MissionComputer:
-    def __init__(self):
+    def __init__(self, history_store=None):
         self.env_values = {
             'mars_base_internal_temperature': 0.0,
             'mars_base_external_temperature': 0.0,
@@ -36,8 +43,26 @@ class MissionComputer:
         }
         self.ds = DummySensor()
 
-        # 5분 평균을 계산하기 위한 히스토리 저장 공간
-        self.history = {key: [] for key in self.env_values}
+        # 각 센서 값을 읽는 함수
+        self.sensor_readers = {
+            'mars_base_internal_temperature': self.ds.get_internal_temperature,
+            'mars_base_external_temperature': self.ds.get_external_temperature,
+            'mars_base_internal_humidity': self.ds.get_internal_humidity,
+            'mars_base_external_illuminance': self.ds.get_external_illuminance,
+            'mars_base_internal_co2': self.ds.get_internal_co2,
+            'mars_base_internal_oxygen': self.ds.get_internal_oxygen
+        }
+
+        # 최근 1분 / 5분 / 60분 통계를 계산하기 위한 저장 공간 (값을 쌓아 두지 않아 메모리가 일정함)
+        self.aggregator = RollingAggregator(self.env_values)
+
+        # 측정값을 디스크에 계속 쌓아 두는 시계열 저장소 (TimeSeriesStore, 없으면 저장하지 않음)
+        self.history_store = history_store
+
+        # 측정값을 화면 출력, 평균 계산, 저장 등의 구독자에게 나누어 주는 버스
+        # 새 소비자는 수집 루프를 고치지 않고 self.bus.subscribe(이름, 함수)로 추가함
+        self.bus = TelemetryBus()
+        self.average_start = None  # 5분 평균 타이머 시작 시간
 
          # 각 센서 값에 대한 단위 정의
         self.units = {
@@ -50,63 +75,123 @@ class MissionComputer:
         }
 
     def get_sensor_data(self):
-        start_time = time.time()  # 5분 타이머 시작 시간
-
-        while True:
-            # 보너스 과제1: stop.txt 파일을 확인하여 종료 조건을 감지함
-            try:
-                with open('stop.txt', 'r') as file:
-                    stop_signal = file.read().strip()
-                    if stop_signal == 'q':
-                        print('System stopped...')
-                        break
-            except FileNotFoundError:
-                with open('stop.txt', 'w') as file:
-                    file.write('')
-
+        self.subscribe_defaults()
+
+        # 보너스 과제1: stop.txt에 'q'가 저장되거나 Ctrl+C를 누르면 종료함
+        # 반복할 때마다 파일을 열지 않고, 파일이 바뀔 때만 확인함 (stop_signal.py 참고)
+        stop = StopSignal('stop.txt')
+        try:
+            self._collect_until(stop)
+        finally:
+            stop.close()
+            self.bus.close()  # 구독자들이 남은 측정값을 모두 처리할 때까지 기다림
+        print('System stopped...')
+
+    def _collect_until(self, stop):
+        while not stop.is_set():
             # 현재 센서 값 수집 및 저장
-            self.env_values['mars_base_internal_temperature'] = self.ds.get_internal_temperature()
-            self.env_values['mars_base_external_temperature'] = self.ds.get_external_temperature()
-            self.env_values['mars_base_internal_humidity'] = self.ds.get_internal_humidity()
-            self.env_values['mars_base_external_illuminance'] = self.ds.get_external_illuminance()
-            self.env_values['mars_base_internal_co2'] = self.ds.get_internal_co2()
-            self.env_values['mars_base_internal_oxygen'] = self.ds.get_internal_oxygen()
-
-            # 각 센서 값 히스토리에 추가 (평균 계산용)
-            for key in self.env_values:
-                self.history[key].append(self.env_values[key])
-
-
-            # 현재 측정값 출력 (JSON 형태 흉내)
-            print('{')
-            for key, value in self.env_values.items():
-                unit = self.units.get(key, '')  # 단위 가져오기 (없으면 빈 문자열)
-                print('  \'{}\': {} {},'.format(key, value, unit))
-            print('}')
-
-
-            # 5분(= 300초) 경과 시 평균값 출력
-            elapsed_time = time.time() - start_time
-            if elapsed_time >= 300:
-                print('\n[5분 평균 환경 정보]')
-                for key in self.history:
-                    values = self.history[key]
-                    if values:  # 값이 존재할 경우 평균 계산
-                        avg = round(sum(values) / len(values), 2)
-                        unit = self.units.get(key, '')
-                        print('  \'{}\': 평균값 = {} {}'.format(key, avg, unit))
-                print('--------------------------\n')
-
-
-                # 평균 출력 후 타이머 및 히스토리 초기화
-                start_time = time.time()
-                for key in self.history:
-                    self.history[key] = []
+            for key, reader in self.sensor_readers.items():
+                self.env_values[key] = reader()
+
+            # 측정 시각과 값을 구독자들에게 전달 (구독자가 느려도 기다리지 않음)
+            self.publish_sample()
+
+            # 5초마다 반복. 기다리는 중에도 종료 신호가 오면 바로 멈춤
+            if stop.wait(5):
+                break
+
+    def publish_sample(self):
+        """현재 측정값을 시각과 함께 구독자들에게 전달"""
+        self.bus.publish((time.time(), dict(self.env_values)))
+
+    def subscribe_defaults(self):
+        """기본 구독자(화면 출력, 평균 계산, 시계열 저장) 중 아직 등록되지 않은 것을 등록"""
+        defaults = {'console': self.print_sample, 'aggregator': self.aggregate_sample}
+        if self.history_store is not None:
+            defaults['history'] = self.save_sample
+        current = self.bus.stats()
+        for name, handler in defaults.items():
+            if name not in current:
+                self.bus.subscribe(name, handler)
+
+    def print_sample(self, sample):
+        """현재 측정값 출력 (JSON 형태 흉내)"""
+        _, values = sample
+        print('{')
+        for key, value in values.items():
+            unit = self.units.get(key, '')  # 단위 가져오기 (없으면 빈 문자열)
+            print('  \'{}\': {} {},'.format(key, value, unit))
+        print('}')
+
+    def aggregate_sample(self, sample):
+        """구간 통계에 추가하고, 5분(= 300초) 경과 시 평균값 출력"""
+        timestamp, values = sample
+        self.aggregator.update_all(values)
+        if self.average_start is None:
+            self.average_start = timestamp
+        if timestamp - self.average_start >= 300:
+            print('\n[5분 평균 환경 정보]')
+            for key in values:
+                stats = self.aggregator.stats(key, 300)
+                if stats:  # 값이 존재할 경우 평균 출력
+                    avg = round(stats['mean'], 2)
+                    unit = self.units.get(key, '')
+                    print('  \'{}\': 평균값 = {} {}'.format(key, avg, unit))
+            print('--------------------------\n')
+
+            # 평균 출력 후 타이머 초기화 (오래된 값은 구간에서 저절로 빠짐)
+            self.average_start = timestamp
+
+    def save_sample(self, sample):
+        """시계열 저장소에 측정값 저장"""
+        timestamp, values = sample
+        self.history_store.append(timestamp, values)
+
+    def store_reading(self, key, value, timestamp):
+        """비동기 수집에서 값을 읽을 때마다 호출됨. 현재 값만 바꾸고, 구독자에게는 publish_sample로 전달"""
+        self.env_values[key] = value
+
+    def get_sensor_data_async(self, interval=5.0, timeout=1.0, duration=None):
+        """get_sensor_data의 asyncio 버전
+
+        센서를 하나씩 차례로 읽지 않고 이벤트 루프에서 동시에 읽으므로
+        느린 센서가 있어도 다른 센서는 자신의 주기대로 측정된다.
+        timeout초 안에 응답하지 않는 측정은 건너뛰고, duration초가 지나면 끝난다 (None이면 계속).
+        """
+        self.subscribe_defaults()
+        sampler = AsyncSampler(on_reading=self.store_reading)
+        for key, reader in self.sensor_readers.items():
+            # 센서 함수는 일반 함수이므로 스레드에서 실행해서 느린 센서가 이벤트 루프를 멈추지 않게 함
+            sampler.add_sensor(key, reader, interval=interval, timeout=timeout, blocking=True)
+
+        # 센서마다 읽는 시각이 다르므로, interval마다 그때까지 읽은 값을 모아 동기 수집과 같은 방법으로 전달
+        # (화면 출력, 평균 계산, 시계열 저장 모두 버스의 구독자가 처리함)
+        async def publish_forever():
+            while True:
+                await asyncio.sleep(interval)
+                self.publish_sample()
+
+        async def run():
+            # stop.txt 또는 Ctrl+C로 종료 신호가 오면 이벤트 루프에서 수집을 멈춤
+            loop = asyncio.get_running_loop()
+            stop.add_callback(lambda: loop.call_soon_threadsafe(sampler.stop))
+            publisher = asyncio.create_task(publish_forever())
+            try:
+                await sampler.run(duration)
+            finally:
+                publisher.cancel()
 
-            # 5초마다 반복
-            time.sleep(5)
+        stop = StopSignal('stop.txt')
+        try:
+            asyncio.run(run())
+        finally:
+            stop.close()
+            self.bus.close()  # 구독자들이 남은 측정값을 모두 처리할 때까지 기다림
+        return sampler
 
 
 # MissionComputer 인스턴스를 RunComputer로 생성하고 센서 수집을 시작
-RunComputer = MissionComputer()
-RunComputer.get_sensor_data()
\ No newline at end of file
+if __name__ == '__main__':
+    with TimeSeriesStore('mission_history') as store:
+        RunComputer = MissionComputer(history_store=store)
+        RunComputer.get_sensor_data()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import math
+import time
+
+# 센서 값의 최근 1분 / 5분 / 60분 통계(개수, 평균, 최솟값, 최댓값, 분산)를 고정된 메모리로 계산하는 모듈.
+# 값을 모두 리스트에 쌓아 두고 sum(values) / len(values)를 구하는 대신,
+# 구간을 일정한 개수의 칸(bucket)으로 나누어 칸마다 개수, 합, 제곱의 합, 최솟값, 최댓값만 기록한다.
+# 칸은 원형 버퍼(ring buffer)로 돌려 쓰므로 메모리는 항상 같고, 값 하나를 추가하는 비용도 일정하다.
+# 오래된 칸이 빠질 때 그 칸의 합을 전체 합에서 빼기 때문에 평균과 분산은 바로 계산되고,
+# 최솟값과 최댓값은 칸 개수만큼만 살펴본다.
+# 칸 하나의 길이(구간 / 칸 수)만큼은 경계가 부정확할 수 있다. (예: 5분 구간, 60칸이면 5초)
+
+# 기본 구간: 1분, 5분, 60분
+DEFAULT_WINDOWS = (60, 300, 3600)
+# 구간 하나를 나누는 칸 수
+DEFAULT_BUCKETS = 60
+
+
+class RollingWindow:
+    def __init__(self, window_seconds, bucket_count=DEFAULT_BUCKETS):
+        self.window_seconds = window_seconds
+        self.bucket_count = bucket_count
+        self.bucket_seconds = window_seconds / bucket_count
+        self.counts = [0] * bucket_count
+        self.sums = [0.0] * bucket_count
+        self.squares = [0.0] * bucket_count
+        self.mins = [math.inf] * bucket_count
+        self.maxs = [-math.inf] * bucket_count
+        self.total_count = 0
+        self.total_sum = 0.0
+        self.total_square = 0.0
+        self.current = None  # 가장 최근 칸의 번호 (시각 // 칸 길이)
+
+    # 칸 하나를 비우고 전체 합에서 그 칸의 값을 뺌
+    def _clear(self, index):
+        self.total_count -= self.counts[index]
+        self.total_sum -= self.sums[index]
+        self.total_square -= self.squares[index]
+        self.counts[index] = 0
+        self.sums[index] = 0.0
+        self.squares[index] = 0.0
+        self.mins[index] = math.inf
+        self.maxs[index] = -math.inf
+
+    # now가 속한 칸까지 시간을 진행하면서 구간을 벗어난 칸을 비움 (최대 칸 수만큼)
+    def _advance(self, now):
+        bucket = int(now // self.bucket_seconds)
+        if self.current is None:
+            self.current = bucket
+            return
+        if bucket <= self.current:
+            return
+        if bucket - self.current >= self.bucket_count:
+            for index in range(self.bucket_count):
+                self._clear(index)
+        else:
+            for old in range(self.current + 1, bucket + 1):
+                self._clear(old % self.bucket_count)
+        if self.total_count == 0:
+            # 모든 칸이 비었으면 누적 오차도 함께 없앰
+            self.total_sum = 0.0
+            self.total_square = 0.0
+        self.current = bucket
+
+    def add(self, value, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        index = self.current % self.bucket_count
+        self.counts[index] += 1
+        self.sums[index] += value
+        self.squares[index] += value * value
+        if value < self.mins[index]:
+            self.mins[index] = value
+        if value > self.maxs[index]:
+            self.maxs[index] = value
+        self.total_count += 1
+        self.total_sum += value
+        self.total_square += value * value
+
+    # 구간 안의 통계. 값이 없으면 None
+    def stats(self, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        count = self.total_count
+        if count == 0:
+            return None
+        mean = self.total_sum / count
+        # 모분산. 빼기에서 생긴 오차로 아주 작은 음수가 나오지 않도록 0 이상으로 맞춤
+        variance = max(self.total_square / count - mean * mean, 0.0)
+        return {
+            'count': count,
+            'mean': mean,
+            'min': min(self.mins),
+            'max': max(self.maxs),
+            'variance': variance,
+        }
+
+
+class RollingAggregator:
+    """센서 항목마다 여러 구간(기본 1분, 5분, 60분)의 RollingWindow를 관리"""
+
+    def __init__(self, keys, windows=DEFAULT_WINDOWS, bucket_count=DEFAULT_BUCKETS):
+        self.windows = tuple(windows)
+        self.rolling = {
+            key: {window: RollingWindow(window, bucket_count) for window in self.windows}
+            for key in keys
+        }
+
+    def update(self, key, value, now=None):
+        if now is None:
+            now = time.monotonic()
+        for window in self.rolling[key].values():
+            window.add(value, now)
+
+    def update_all(self, values, now=None):
+        """{항목: 값} 딕셔너리를 한 번에 추가"""
+        if now is None:
+            now = time.monotonic()
+        for key, value in values.items():
+            self.update(key, value, now)
+
+    def stats(self, key, window, now=None):
+        return self.rolling[key][window].stats(now)
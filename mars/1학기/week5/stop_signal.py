@@ -0,0 +1,202 @@
+import os
+import sys
+import errno
+import select
+import signal
+import struct
+import threading
+
+# 수집 루프를 멈추는 신호를 관리하는 모듈.
+# 예전에는 반복할 때마다 stop.txt를 열어 'q'가 들어 있는지 확인했기 때문에
+# 측정 주기가 짧아질수록 파일을 여닫는 비용이 커졌다.
+# StopSignal은 threading.Event 하나로 종료 여부를 알려주고, 다음 중 하나가 일어나면 설정된다.
+#   - stop.txt에 'q'가 저장됨: Linux에서는 inotify로 파일 변경을 기다리므로 아무 일이 없을 때는 비용이 없음.
+#     inotify를 쓸 수 없으면 POLL_INTERVAL마다 os.stat으로 변경 여부만 확인 (파일은 바뀌었을 때만 읽음)
+#   - Ctrl+C(SIGINT) 또는 SIGTERM
+# 루프는 time.sleep 대신 stop.wait(주기)를 사용하므로 주기와 상관없이 바로 멈춘다.
+
+# inotify를 쓸 수 없을 때 stop.txt를 확인하는 간격 (초). 종료 지연이 100ms를 넘지 않도록 함
+POLL_INTERVAL = 0.05
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_FORMAT = 'iIII'
+INOTIFY_EVENT_SIZE = struct.calcsize(INOTIFY_EVENT_FORMAT)
+
+
+def load_inotify():
+    """libc의 inotify 함수를 ctypes로 불러옴. 사용할 수 없는 환경이면 None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+class StopSignal:
+    def __init__(self, stop_file='stop.txt', stop_word='q', handle_signals=True, use_inotify=True):
+        self.stop_file = os.path.abspath(stop_file)
+        self.stop_word = stop_word
+        self.event = threading.Event()
+        self.callbacks = []
+        # 시그널 처리기가 같은 스레드에서 set()을 다시 호출할 수 있으므로 RLock 사용
+        self.lock = threading.RLock()
+        self.watch_fd = None
+        self.wake_pipe = None
+        self.closed = False
+        self.previous_handlers = {}
+
+        # 처음 한 번만 stop.txt를 확인하고, 없으면 빈 파일을 만듦
+        try:
+            self.check_file()
+        except FileNotFoundError:
+            with open(self.stop_file, 'w') as file:
+                file.write('')
+
+        if handle_signals and threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, getattr(signal, 'SIGTERM', None)):
+                if signum is not None:
+                    self.previous_handlers[signum] = signal.signal(signum, self._handle_signal)
+
+        if use_inotify and self._start_inotify():
+            target = self._watch_inotify
+        else:
+            target = self._watch_polling
+        self.watcher = threading.Thread(target=target, daemon=True)
+        self.watcher.start()
+        # 처음 확인한 뒤 감시를 시작하기 전에 바뀌었을 수도 있으므로 한 번 더 확인
+        self._check_quietly()
+
+    def is_set(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        """종료 신호가 오거나 timeout초가 지날 때까지 기다림. 종료 신호가 왔으면 True"""
+        return self.event.wait(timeout)
+
+    def add_callback(self, callback):
+        """종료 신호가 올 때 호출할 함수 등록 (이미 종료되었으면 바로 호출)"""
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def set(self):
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            callbacks = self.callbacks
+            self.callbacks = []
+        for callback in callbacks:
+            callback()
+        self._wake_watcher()
+
+    def check_file(self):
+        """stop.txt에 종료 문자가 들어 있으면 종료 신호를 설정"""
+        with open(self.stop_file, 'r') as file:
+            if file.read().strip() == self.stop_word:
+                self.set()
+
+    def _handle_signal(self, signum, frame):
+        self.set()
+
+    def _start_inotify(self):
+        libc = load_inotify()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            return False
+        directory = os.path.dirname(self.stop_file)
+        mask = IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return False
+        self.watch_fd = fd
+        self.wake_pipe = os.pipe()
+        return True
+
+    def _wake_watcher(self):
+        with self.lock:
+            if self.wake_pipe is not None:
+                try:
+                    os.write(self.wake_pipe[1], b'x')
+                except OSError:
+                    pass
+
+    def _watch_inotify(self):
+        name = os.fsencode(os.path.basename(self.stop_file))
+        try:
+            while not self.event.is_set():
+                # 디렉토리에 변경이 생기거나 close()가 깨울 때까지 잠듦 (CPU를 쓰지 않음)
+                readable, _, _ = select.select([self.watch_fd, self.wake_pipe[0]], [], [])
+                if self.wake_pipe[0] in readable:
+                    break
+                data = os.read(self.watch_fd, 4096)
+                changed = False
+                offset = 0
+                while offset + INOTIFY_EVENT_SIZE <= len(data):
+                    _, _, _, length = struct.unpack_from(INOTIFY_EVENT_FORMAT, data, offset)
+                    event_name = data[offset + INOTIFY_EVENT_SIZE:offset + INOTIFY_EVENT_SIZE + length]
+                    if event_name.rstrip(b'\0') == name:
+                        changed = True
+                    offset += INOTIFY_EVENT_SIZE + length
+                if changed:
+                    self._check_quietly()
+        except OSError as e:
+            if e.errno != errno.EBADF:
+                print(f"stop.txt 감시 중 오류 발생: {e}")
+        finally:
+            self._close_fds()
+
+    def _watch_polling(self):
+        last = None
+        while not self.event.wait(POLL_INTERVAL) and not self.closed:
+            try:
+                stat = os.stat(self.stop_file)
+                current = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                current = None
+            if current != last:
+                last = current
+                if current is not None:
+                    self._check_quietly()
+
+    def _check_quietly(self):
+        try:
+            self.check_file()
+        except (FileNotFoundError, PermissionError, UnicodeDecodeError):
+            pass
+
+    def _close_fds(self):
+        with self.lock:
+            if self.watch_fd is not None:
+                os.close(self.watch_fd)
+                self.watch_fd = None
+            if self.wake_pipe is not None:
+                os.close(self.wake_pipe[0])
+                os.close(self.wake_pipe[1])
+                self.wake_pipe = None
+
+    def close(self):
+        """감시 스레드를 끝내고 시그널 처리기를 원래대로 되돌림 (종료 신호는 설정하지 않음)"""
+        self.closed = True
+        if threading.current_thread() is threading.main_thread():
+            for signum, handler in self.previous_handlers.items():
+                signal.signal(signum, handler)
+            self.previous_handlers = {}
+        self._wake_watcher()
+        if self.watcher is not threading.current_thread():
+            self.watcher.join(1.0)
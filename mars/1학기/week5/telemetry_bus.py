@@ -0,0 +1,96 @@
+import threading
+from collections import deque
+
+# 측정값을 여러 소비자(화면 출력, 파일 저장, 평균 계산, 네트워크 전송 등)에게 나누어 주는 발행/구독(pub/sub) 버스.
+# 수집 루프는 publish()만 호출하고, 각 구독자는 자신의 스레드에서 큐에 쌓인 값을 처리한다.
+# 구독자마다 큐의 크기가 정해져 있어서 느린 구독자가 있으면 그 구독자의 가장 오래된 값부터 버린다.
+# 따라서 어떤 구독자가 느려도 수집 루프나 다른 구독자는 기다리지 않는다.
+
+# 구독자 큐의 기본 크기
+DEFAULT_QUEUE_SIZE = 1024
+
+
+class Subscription:
+    def __init__(self, name, handler, queue_size):
+        self.name = name
+        self.handler = handler
+        self.queue = deque(maxlen=queue_size)  # 가득 차면 append할 때 가장 오래된 값이 빠짐
+        self.condition = threading.Condition()
+        self.dropped = 0    # 큐가 가득 차서 버린 값의 수
+        self.delivered = 0  # 처리한 값의 수
+        self.errors = 0
+        self.closing = False
+        self.thread = threading.Thread(target=self._run, name=f'telemetry-{name}', daemon=True)
+
+    def put(self, sample):
+        with self.condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(sample)
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.closing:
+                    self.condition.wait()
+                if not self.queue:
+                    return  # 닫는 중이고 남은 값도 없음
+                sample = self.queue.popleft()
+            try:
+                self.handler(sample)
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"구독자 '{self.name}' 처리 중 오류 발생: {e}")
+
+    def close(self, timeout=None):
+        """남은 값을 모두 처리한 뒤 스레드를 끝냄"""
+        with self.condition:
+            self.closing = True
+            self.condition.notify()
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+
+class TelemetryBus:
+    def __init__(self):
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, name, handler, queue_size=DEFAULT_QUEUE_SIZE):
+        """handler(sample)를 구독자로 등록. 구독자마다 스레드 하나와 크기가 queue_size인 큐가 생김"""
+        subscription = Subscription(name, handler, queue_size)
+        with self.lock:
+            if name in self.subscriptions:
+                raise ValueError(f"이미 등록된 구독자입니다: {name}")
+            self.subscriptions[name] = subscription
+        subscription.thread.start()
+        return subscription
+
+    def unsubscribe(self, name, timeout=None):
+        with self.lock:
+            subscription = self.subscriptions.pop(name, None)
+        if subscription is not None:
+            subscription.close(timeout)
+
+    def publish(self, sample):
+        """모든 구독자의 큐에 sample을 넣음. 구독자가 처리할 때까지 기다리지 않음"""
+        with self.lock:
+            subscriptions = list(self.subscriptions.values())
+        for subscription in subscriptions:
+            subscription.put(sample)
+
+    def stats(self):
+        """구독자별 (처리한 수, 버린 수, 오류 수, 큐에 남은 수)"""
+        with self.lock:
+            subscriptions = list(self.subscriptions.values())
+        return {s.name: (s.delivered, s.dropped, s.errors, len(s.queue)) for s in subscriptions}
+
+    def close(self, timeout=None):
+        """모든 구독자가 남은 값을 처리하고 끝날 때까지 기다림"""
+        with self.lock:
+            subscriptions = list(self.subscriptions.values())
+            self.subscriptions = {}
+        for subscription in subscriptions:
+            subscription.close(timeout)
@@ -0,0 +1,334 @@
+import os
+import sys
+import bisect
+import struct
+from array import array
+from itertools import accumulate
+
+# MissionComputer의 환경 값을 디스크에 쌓아 두는 시계열 저장소.
+# 5분 평균을 출력한 뒤 값을 버리면 추세를 보려고 할 때 다시 수집해야 하므로
+# 측정값을 단계(tier)별 파일에 이어 쓰기(append-only)로 저장한다.
+#   raw: 측정값 그대로 / 1m: 1분 평균 / 1h: 1시간 평균
+# 1m, 1h 단계는 측정값을 추가할 때 자동으로 만들어지므로, 한 달치를 조회할 때는 1h 파일만 읽으면 된다.
+#
+# 파일 형식 (little endian):
+#   헤더: magic 'MTSDB001' | 항목 수(2) | 예약(2) | 기준 시각(첫 레코드의 시각, ms, 8) | 항목마다 배율(8바이트 실수)
+#   레코드: 4바이트 정수 (1 + 항목 수)개
+#           이전 레코드와의 시각 차이(ms) | 항목마다 (값 x 배율)의 이전 레코드와의 차이
+# 값은 배율을 곱해 정수로 저장하고(예: 소수 둘째 자리까지면 100), 이전 값과의 차이만 기록하므로
+# 센서 값처럼 천천히 변하는 값은 작은 정수가 된다.
+# 시각 차이가 24일을 넘으면 값 없이 시각만 GAP_STEP만큼 진행하는 레코드(GAP)를 넣는다.
+
+MAGIC = b'MTSDB001'
+HEADER_FORMAT = '<8sHHq'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+GAP = 2 ** 31 - 1
+GAP_STEP = GAP - 1
+
+# 색인 파일 (단계마다 '<단계>.tsidx'):
+#   헤더: magic 'MTSIDX01' | 항목 수(2) | 예약(6)
+#   항목: 레코드 번호(8) | 그 레코드 직전의 시각(ms, 8) | 그 레코드 직전의 항목별 정수 값(8 x 항목 수)
+# 레코드는 이전 레코드와의 차이만 저장하므로 중간부터 읽으려면 그 직전의 절대값이 필요하다.
+# INDEX_INTERVAL개의 레코드마다 직전 상태를 색인에 남겨 두면
+#   - 파일을 열 때는 마지막 색인 항목부터 끝까지(최대 INDEX_INTERVAL개)만 읽어 마지막 시각과 값을 얻고
+#   - 조회할 때는 시작 시각 직전의 색인 항목으로 바로 이동해서 구간이 끝나면 읽기를 멈춘다.
+# 색인은 데이터 파일에서 다시 만들 수 있으므로, 없거나 모자라면 파일을 열 때 채운다.
+INDEX_MAGIC = b'MTSIDX01'
+INDEX_HEADER_FORMAT = '<8sH6x'
+INDEX_HEADER_SIZE = struct.calcsize(INDEX_HEADER_FORMAT)
+INDEX_INTERVAL = 1024
+
+# 단계 이름 -> 평균을 내는 구간 (초). raw는 구간 없음
+TIERS = {'raw': None, '1m': 60, '1h': 3600}
+
+# MissionComputer 환경 값의 배율 (DummySensor의 반올림 자릿수와 같음)
+METRIC_SCALES = {
+    'mars_base_internal_temperature': 100,
+    'mars_base_external_temperature': 100,
+    'mars_base_internal_humidity': 100,
+    'mars_base_external_illuminance': 100,
+    'mars_base_internal_co2': 10000,
+    'mars_base_internal_oxygen': 100,
+}
+
+
+class TierFile:
+    """단계 하나의 파일. 마지막 레코드의 시각과 값을 기억해 두고 차이만 이어 씀"""
+
+    def __init__(self, path, metrics, scales):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + '.tsidx'
+        self.metrics = metrics
+        self.scales = scales
+        self.stride = 1 + len(metrics)
+        self.record_size = 4 * self.stride
+        self.entry_format = f'<qq{len(metrics)}q'
+        self.entry_size = struct.calcsize(self.entry_format)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as file:
+                file.write(struct.pack(HEADER_FORMAT, MAGIC, len(metrics), 0, 0))
+                file.write(struct.pack(f'<{len(metrics)}d', *scales))
+            # 새 데이터 파일이므로 남아 있는 색인은 쓸 수 없음
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+        self.header_size = HEADER_SIZE + 8 * len(metrics)
+        self.base_time = self._check_header()
+
+        # 쓰다 만 마지막 레코드가 있으면 잘라냄 (남겨 두면 뒤에 이어 쓰는 레코드의 위치가 어긋남)
+        data_size = os.path.getsize(path) - self.header_size
+        self.record_count = data_size // self.record_size
+        if data_size % self.record_size:
+            os.truncate(path, self.header_size + self.record_count * self.record_size)
+        self.has_records = self.record_count > 0
+
+        # 색인 항목: 레코드 번호, 직전 시각, 직전 값 (첫 항목은 파일의 처음)
+        self.index_records = [0]
+        self.index_times = [self.base_time]
+        self.index_values = [[0] * len(metrics)]
+        self._load_index()
+
+        # 마지막 색인 항목부터 끝까지만 읽어서 마지막 시각과 값을 구하고, 모자란 색인 항목을 채움
+        self.last_time = self.index_times[-1]
+        self.last_values = list(self.index_values[-1])
+        for first, deltas, times, values in self._iter_chunks(len(self.index_times) - 1):
+            if first > self.index_records[-1]:
+                self._add_index_entry(first, self.last_time, self.last_values)
+            self.last_time = times[-1]
+            self.last_values = [column[-1] for column in values]
+        self.file = open(path, 'ab')
+
+    def _check_header(self):
+        with open(self.path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"'{self.path}' is not a compatible time-series file.")
+            magic, count, _, base_time = struct.unpack(HEADER_FORMAT, header)
+            scales = list(struct.unpack(f'<{count}d', file.read(8 * count)))
+        if magic != MAGIC or count != len(self.metrics) or scales != list(self.scales):
+            raise ValueError(f"'{self.path}' is not a compatible time-series file.")
+        return base_time
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b''
+        valid = len(data) >= INDEX_HEADER_SIZE and struct.unpack_from(INDEX_HEADER_FORMAT, data) == (
+            INDEX_MAGIC, len(self.metrics))
+        if not valid:
+            with open(self.index_path, 'wb') as file:
+                file.write(struct.pack(INDEX_HEADER_FORMAT, INDEX_MAGIC, len(self.metrics)))
+            return
+        count = (len(data) - INDEX_HEADER_SIZE) // self.entry_size
+        for position in range(INDEX_HEADER_SIZE, INDEX_HEADER_SIZE + count * self.entry_size, self.entry_size):
+            record, timestamp, *values = struct.unpack_from(self.entry_format, data, position)
+            # 데이터 파일에 아직 없는 레코드를 가리키는 항목은 버림 (데이터를 쓰기 전에 꺼진 경우)
+            if record > self.record_count or record <= self.index_records[-1]:
+                break
+            self.index_records.append(record)
+            self.index_times.append(timestamp)
+            self.index_values.append(values)
+        # 버린 항목과 쓰다 만 항목을 잘라냄
+        os.truncate(self.index_path, INDEX_HEADER_SIZE + (len(self.index_records) - 1) * self.entry_size)
+
+    def _add_index_entry(self, record, timestamp, values):
+        with open(self.index_path, 'ab') as file:
+            file.write(struct.pack(self.entry_format, record, timestamp, *values))
+        self.index_records.append(record)
+        self.index_times.append(timestamp)
+        self.index_values.append(list(values))
+
+    # 색인 항목 position부터 INDEX_INTERVAL개씩 레코드를 읽어 (첫 레코드 번호, 시각 차이 목록, 시각 목록, 항목별 값 목록)을 돌려줌.
+    # 시각과 값은 절대값이고 GAP 레코드도 포함됨
+    def _iter_chunks(self, position):
+        record = self.index_records[position]
+        last_time = self.index_times[position]
+        last_values = self.index_values[position]
+        with open(self.path, 'rb') as file:
+            file.seek(self.header_size + record * self.record_size)
+            while record < self.record_count:
+                count = min(INDEX_INTERVAL - record % INDEX_INTERVAL, self.record_count - record)
+                records = array('i')
+                records.frombytes(file.read(count * self.record_size))
+                if sys.byteorder != 'little':
+                    records.byteswap()
+                deltas = records[0::self.stride]
+                steps = [GAP_STEP if delta == GAP else delta for delta in deltas]
+                times = list(accumulate(steps, initial=last_time))[1:]
+                values = [list(accumulate(records[k::self.stride], initial=last_values[k - 1]))[1:]
+                          for k in range(1, self.stride)]
+                yield record, deltas, times, values
+                record += count
+                last_time = times[-1]
+                last_values = [column[-1] for column in values]
+
+    def read_range(self, start_ms=None, end_ms=None):
+        """[start_ms, end_ms) 구간의 (시각 목록, 항목별 정수 값 목록). GAP 레코드는 결과에 넣지 않음
+
+        시작 시각 직전의 색인 항목부터 읽고, 구간이 끝나면 더 읽지 않는다.
+        """
+        self.file.flush()
+        position = 0
+        if start_ms is not None:
+            # 직전 시각이 start_ms보다 앞선 마지막 색인 항목. 그 앞의 레코드는 모두 구간 밖임
+            position = max(bisect.bisect_left(self.index_times, start_ms) - 1, 0)
+        result_times = []
+        result_values = [[] for _ in self.metrics]
+        for _, deltas, times, values in self._iter_chunks(position):
+            for i, timestamp in enumerate(times):
+                if end_ms is not None and timestamp >= end_ms:
+                    return result_times, result_values
+                if deltas[i] == GAP or (start_ms is not None and timestamp < start_ms):
+                    continue
+                result_times.append(timestamp)
+                for column, source in zip(result_values, values):
+                    column.append(source[i])
+        return result_times, result_values
+
+    def read_all(self):
+        """파일 전체를 읽어 (시각 목록, 항목별 정수 값 목록)을 반환"""
+        return self.read_range()
+
+    def _write_record(self, records, delta, values):
+        # INDEX_INTERVAL번째 레코드마다 그 직전 상태를 색인에 남김
+        if self.record_count % INDEX_INTERVAL == 0 and self.record_count > self.index_records[-1]:
+            self._add_index_entry(self.record_count, self.last_time, self.last_values)
+        records.append(delta)
+        records.extend(value - last for value, last in zip(values, self.last_values))
+        self.last_time += GAP_STEP if delta == GAP else delta
+        self.last_values = list(values)
+        self.record_count += 1
+
+    def append(self, timestamp_ms, scaled_values):
+        if not self.has_records:
+            # 첫 레코드의 시각을 기준 시각으로 헤더에 기록해서 시각 차이가 작은 정수가 되도록 함
+            self.file.flush()
+            with open(self.path, 'r+b') as file:
+                file.seek(struct.calcsize('<8sHH'))
+                file.write(struct.pack('<q', timestamp_ms))
+            self.base_time = timestamp_ms
+            self.last_time = timestamp_ms
+            self.index_times[0] = timestamp_ms
+            self.has_records = True
+        delta = timestamp_ms - self.last_time
+        if delta < 0:
+            raise ValueError('시각이 이전 레코드보다 앞설 수 없습니다.')
+        records = array('i')
+        while delta >= GAP:
+            self._write_record(records, GAP, self.last_values)
+            delta -= GAP_STEP
+        self._write_record(records, delta, scaled_values)
+        if sys.byteorder != 'little':
+            records.byteswap()
+        self.file.write(records.tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class TimeSeriesStore:
+    def __init__(self, directory='mission_history', scales=None):
+        """directory 안에 단계별 파일(raw.tsdb, 1m.tsdb, 1h.tsdb)을 만들거나 이어서 씀"""
+        os.makedirs(directory, exist_ok=True)
+        self.scales = dict(scales or METRIC_SCALES)
+        self.metrics = list(self.scales)
+        scale_values = [self.scales[key] for key in self.metrics]
+        self.tiers = {
+            name: TierFile(os.path.join(directory, f'{name}.tsdb'), self.metrics, scale_values)
+            for name in TIERS
+        }
+        # 평균을 아직 기록하지 않은 구간: 단계 이름 -> [구간 시작(ms), 개수, 항목별 합]
+        self.pending = {}
+        self.clock_behind = False  # 시스템 시계가 뒤로 간 상태인지 (경고를 한 번만 출력하기 위함)
+        self._restore_pending()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # 이전 실행에서 평균을 기록하지 못한 구간을 raw 파일에서 다시 채움
+    # 마지막으로 기록한 구간이 끝난 뒤의 측정값만 색인으로 찾아 읽으므로 보통 한 시간 이내의 레코드만 읽음
+    def _restore_pending(self):
+        for name, width in TIERS.items():
+            if width is None:
+                continue
+            tier = self.tiers[name]
+            written_until = tier.last_time + width * 1000 if tier.has_records else None
+            times, values = self.tiers['raw'].read_range(written_until)
+            for i, timestamp in enumerate(times):
+                self._add_to_bucket(name, width, timestamp, [column[i] for column in values])
+
+    def _add_to_bucket(self, name, width, timestamp_ms, scaled_values):
+        start = timestamp_ms - timestamp_ms % (width * 1000)
+        bucket = self.pending.get(name)
+        if bucket is not None and bucket[0] != start:
+            self._write_bucket(name, bucket)
+            bucket = None
+        if bucket is None:
+            bucket = [start, 0, [0] * len(scaled_values)]
+            self.pending[name] = bucket
+        bucket[1] += 1
+        bucket[2] = [total + value for total, value in zip(bucket[2], scaled_values)]
+
+    def _write_bucket(self, name, bucket):
+        start, count, totals = bucket
+        self.tiers[name].append(start, [round(total / count) for total in totals])
+
+    def append(self, timestamp, env_values):
+        """측정값 하나를 저장. timestamp는 time.time()과 같은 초 단위, env_values는 {항목: 값}
+
+        시스템 시계가 뒤로 조정되어(NTP 등) timestamp가 마지막 레코드보다 앞서면
+        측정값은 버리지 않고 마지막 레코드의 시각으로 저장한다.
+        """
+        timestamp_ms = round(timestamp * 1000)
+        last_time = self.tiers['raw'].last_time
+        if self.tiers['raw'].has_records and timestamp_ms < last_time:
+            if not self.clock_behind:
+                print(f"⚠️ 시스템 시계가 {(last_time - timestamp_ms) / 1000:.3f}초 뒤로 조정되었습니다. "
+                      "시계가 따라잡을 때까지 마지막 기록 시각으로 저장합니다.")
+                self.clock_behind = True
+            timestamp_ms = last_time
+        else:
+            self.clock_behind = False
+        scaled = [round(env_values[key] * self.scales[key]) for key in self.metrics]
+        self.tiers['raw'].append(timestamp_ms, scaled)
+        for name, width in TIERS.items():
+            if width is not None:
+                self._add_to_bucket(name, width, timestamp_ms, scaled)
+
+    def choose_tier(self, start, end):
+        """조회 구간의 길이에 맞는 단계 (6시간 이하 raw, 7일 이하 1m, 그보다 길면 1h)"""
+        span = end - start
+        if span <= 6 * 3600:
+            return 'raw'
+        if span <= 7 * 24 * 3600:
+            return '1m'
+        return '1h'
+
+    def query(self, start, end, tier=None):
+        """[start, end) 구간의 (시각(초), {항목: 값}) 목록. tier를 주지 않으면 구간 길이로 단계를 고름
+
+        선택한 단계의 파일에서 색인으로 구간 근처만 읽으며, 1m/1h 단계의 시각은 구간의 시작 시각이다.
+        """
+        if tier is None:
+            tier = self.choose_tier(start, end)
+        times, values = self.tiers[tier].read_range(start * 1000, end * 1000)
+        return [
+            (timestamp / 1000, {key: values[k][i] / self.scales[key] for k, key in enumerate(self.metrics)})
+            for i, timestamp in enumerate(times)
+        ]
+
+    def flush(self):
+        for tier in self.tiers.values():
+            tier.flush()
+
+    def close(self):
+        """파일을 닫음. 아직 끝나지 않은 1m/1h 구간은 다음 실행에서 raw 파일로부터 이어서 계산함"""
+        for tier in self.tiers.values():
+            tier.close()
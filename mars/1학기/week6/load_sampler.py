@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+
+import psutil
+
+# 미션 컴퓨터의 부하를 백그라운드 스레드에서 주기적으로 측정해 두는 모듈.
+# psutil.cpu_percent(interval=1)은 1초 동안 기다리면서 측정하므로 호출할 때마다 1초씩 멈춘다.
+# LoadSampler는 interval마다 한 번에 모든 부하 값을 측정해서 최신 값만 보관하므로,
+# 값을 읽는 쪽은 기다리지 않고 바로 결과를 얻는다.
+#
+# 측정 한 번(sample_once)에서 읽는 것:
+#   - CPU: psutil.cpu_times(percpu=True) 한 번으로 코어별 사용률과 전체 사용률을 함께 계산
+#   - 메모리: psutil.virtual_memory()
+#   - 디스크, 네트워크: 누적 카운터 한 번씩 읽고 이전 측정과의 차이로 초당 값을 계산
+#   - 프로세스: Linux에서는 프로세스마다 /proc/<pid>/stat 파일 하나만 읽어 이름, CPU 시간, 메모리(RSS)를 얻음
+#     (psutil.process_iter는 프로세스마다 파일을 여러 개 열어서 수백 개일 때 5배쯤 느림)
+#     /proc이 없는 운영체제에서는 psutil.process_iter로 필요한 속성만 읽음
+# 사용률과 초당 값은 모두 이전 측정과의 차이로 구하므로 측정하면서 기다리는 일이 없다.
+# 측정에 쓴 CPU 시간(측정 스레드만, 다른 스레드는 제외)은 'collect_seconds'로 기록해 두어 측정 비용을 확인할 수 있다.
+
+# 기본 측정 주기 (초)
+DEFAULT_INTERVAL = 1.0
+
+# psutil.process_iter로 프로세스마다 읽는 속성 (/proc이 없을 때)
+PROCESS_ATTRS = ['pid', 'name', 'memory_info', 'cpu_times']
+
+PROC_DIR = '/proc'
+
+
+# /proc/<pid>/stat에서 읽은 {pid: (이름, 누적 CPU 시간(초), RSS(바이트))}
+def read_proc_stats(proc_dir=PROC_DIR):
+    ticks = os.sysconf('SC_CLK_TCK')
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    stats = {}
+    for entry in os.listdir(proc_dir):
+        if not entry.isdigit():
+            continue
+        try:
+            fd = os.open(f'{proc_dir}/{entry}/stat', os.O_RDONLY)
+            try:
+                data = os.read(fd, 4096)
+            finally:
+                os.close(fd)
+        except OSError:
+            continue  # 그 사이에 종료된 프로세스
+        # 이름에 공백이나 괄호가 들어갈 수 있으므로 마지막 ')' 뒤부터 나눔
+        end = data.rfind(b')')
+        fields = data[end + 2:].split()
+        if len(fields) < 22:
+            continue
+        name = data[data.find(b'(') + 1:end].decode('utf-8', 'replace')
+        cpu_time = (int(fields[11]) + int(fields[12])) / ticks  # utime + stime
+        stats[int(entry)] = (name, cpu_time, int(fields[21]) * page_size)
+    return stats
+
+
+# psutil.process_iter로 읽은 {pid: (이름, 누적 CPU 시간(초), RSS(바이트))}
+def read_psutil_stats():
+    stats = {}
+    for process in psutil.process_iter(PROCESS_ATTRS, ad_value=None):
+        info = process.info
+        times = info['cpu_times']
+        memory = info['memory_info']
+        if times is None or memory is None:
+            continue  # 권한이 없거나 그 사이에 종료된 프로세스
+        stats[info['pid']] = (info['name'], times.user + times.system, memory.rss)
+    return stats
+
+
+# 이전 cpu_times와 현재 cpu_times 사이의 사용률 (%). psutil.cpu_percent와 같은 방식으로 계산
+def cpu_busy_percent(previous, current):
+    def busy_and_total(times):
+        total = sum(times)
+        # guest 시간은 user 시간에 이미 포함되어 있으므로 빼 줌 (Linux)
+        total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+        idle = times.idle + getattr(times, 'iowait', 0)
+        return total - idle, total
+
+    busy_before, total_before = busy_and_total(previous)
+    busy_after, total_after = busy_and_total(current)
+    total = total_after - total_before
+    if total <= 0:
+        return 0.0
+    busy = min(max(busy_after - busy_before, 0.0), total)
+    return round(busy / total * 100, 1)
+
+
+# 코어별 cpu_times를 항목마다 더한 전체 cpu_times
+def sum_cpu_times(per_core_times):
+    return type(per_core_times[0])(*(sum(column) for column in zip(*per_core_times)))
+
+
+# 누적 카운터(namedtuple)의 각 항목과 이전 측정 이후의 초당 값
+def counter_rates(previous, current, elapsed, fields):
+    if current is None:
+        return None
+    result = {}
+    for field in fields:
+        value = getattr(current, field)
+        result[field] = value
+        if previous is not None and elapsed > 0:
+            result[f'{field}_per_sec'] = round(max(value - getattr(previous, field), 0) / elapsed, 1)
+        else:
+            result[f'{field}_per_sec'] = None
+    return result
+
+
+class LoadSampler:
+    def __init__(self, interval=DEFAULT_INTERVAL, collect_processes=True):
+        if interval <= 0:
+            raise ValueError("interval은 0보다 커야 합니다.")
+        self.interval = interval
+        self.collect_processes = collect_processes
+        self.lock = threading.Lock()
+        self.latest = {}  # 항목 -> 최근 측정값, 'timestamp' -> 측정 시각
+        self.ready = threading.Event()  # 첫 측정이 끝나면 설정됨
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # 이전 측정의 누적 값 (차이를 구하는 데 사용)
+        self.previous_time = None
+        self.previous_cpu = None
+        self.previous_disk = None
+        self.previous_net = None
+        self.previous_process_cpu = {}  # pid -> 누적 CPU 시간 (user + system)
+
+    def _read_cpu(self):
+        per_core_times = psutil.cpu_times(percpu=True)
+        cpu, per_core = None, None
+        if self.previous_cpu is not None and len(self.previous_cpu) == len(per_core_times):
+            per_core = [cpu_busy_percent(before, after) for before, after in zip(self.previous_cpu, per_core_times)]
+            # 전체 사용률은 코어별 시간을 항목마다 더해서 계산 (cpu_times를 다시 읽지 않음)
+            cpu = cpu_busy_percent(sum_cpu_times(self.previous_cpu), sum_cpu_times(per_core_times))
+        self.previous_cpu = per_core_times
+        return cpu, per_core
+
+    def _read_processes(self, elapsed):
+        if os.path.isdir(PROC_DIR):
+            stats = read_proc_stats()
+        else:
+            stats = read_psutil_stats()
+        processes = []
+        for pid, (name, cpu_time, rss) in stats.items():
+            before = self.previous_process_cpu.get(pid)
+            cpu_percent = None
+            if before is not None and elapsed:
+                cpu_percent = round(max(cpu_time - before, 0.0) / elapsed * 100, 1)
+            processes.append({
+                'pid': pid,
+                'name': name,
+                'rss': rss,
+                'cpu_time': round(cpu_time, 2),
+                'cpu_percent': cpu_percent,
+            })
+        # 종료된 프로세스는 자연스럽게 빠짐
+        self.previous_process_cpu = {pid: stat[1] for pid, stat in stats.items()}
+        return processes
+
+    def sample_once(self):
+        """모든 부하 항목을 한 번 측정해서 최신 값으로 저장"""
+        started = time.thread_time()
+        now = time.monotonic()
+        elapsed = now - self.previous_time if self.previous_time is not None else None
+
+        cpu, per_core = self._read_cpu()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        values = {
+            'cpu': cpu,
+            'cpu_per_core': per_core,
+            'memory': memory.percent,
+            'disk': counter_rates(self.previous_disk, disk, elapsed,
+                                  ('read_bytes', 'write_bytes', 'read_count', 'write_count')),
+            'network': counter_rates(self.previous_net, net, elapsed,
+                                     ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv')),
+        }
+        if self.collect_processes:
+            values['processes'] = self._read_processes(elapsed)
+        self.previous_time = now
+        self.previous_disk = disk
+        self.previous_net = net
+
+        values['timestamp'] = time.time()
+        values['collect_seconds'] = time.thread_time() - started
+        with self.lock:
+            self.latest = values
+        if cpu is not None:
+            self.ready.set()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample_once()
+            except Exception as e:
+                print(f"부하 측정 중 오류 발생: {e}")
+
+    def start(self):
+        if self.thread is not None:
+            return
+        # 사용률은 이전 측정과의 차이로 구하므로 여기서 기준점을 잡아 둠
+        self.sample_once()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='load-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def wait_ready(self, timeout=None):
+        """첫 측정이 끝날 때까지 기다림. 측정되었으면 True"""
+        return self.ready.wait(timeout)
+
+    def get(self, key):
+        """항목의 최근 측정값. 아직 측정하지 않았으면 None"""
+        with self.lock:
+            return self.latest.get(key)
+
+    def snapshot(self):
+        """최근 측정값 전체의 복사본"""
+        with self.lock:
+            return dict(self.latest)
+
+    def top_processes(self, count=5, key='cpu_percent'):
+        """key(cpu_percent, rss, cpu_time) 기준으로 큰 프로세스 count개"""
+        processes = self.get('processes') or []
+        return sorted(processes, key=lambda p: p[key] or 0, reverse=True)[:count]
@@ -1,75 +1,209 @@
+import argparse
+import functools
 import platform
 import os
 import psutil
 
+from load_sampler import LoadSampler
+from metrics_server import DEFAULT_HOST, DEFAULT_PORT, MetricsServer
+from settings_watcher import SettingsWatcher
+
+
+def read_memory_size():
+    try:
+        mem = psutil.virtual_memory().total
+        return f'{round(mem / (1024**3), 2)} GB'
+    except:
+        return '알 수 없음'
+
+
+@functools.lru_cache(maxsize=None)
+def get_static_info():
+    """실행 중에 바뀌지 않는 시스템 정보. 프로세스에서 처음 호출할 때 한 번만 계산함"""
+    return {
+        'operating_system': platform.system(),
+        'os_version': platform.version(),
+        'cpu_type': platform.processor(),
+        'cpu_cores': os.cpu_count(),
+        'memory_size': read_memory_size(),
+        'hostname': platform.node(),
+        # 실제 GPU 정보 가져오려면 nvidia-smi나 GPUtil 필요
+        'gpu_memory': 'N/A (추후 구현)'  # 예시로 추가
+    }
+
+
 class MissionComputer:
-    def __init__(self):
-        self.info_settings, self.load_settings = self.load_settings()
-
-        # 시스템 정보 항목을 미리 정의한 딕셔너리로 매핑
-        self.info_map = {
-            'operating_system': lambda: platform.system(),
-            'os_version': lambda: platform.version(),
-            'cpu_type': lambda: platform.processor(),
-            'cpu_cores': lambda: os.cpu_count(),
-            'memory_size': self.get_memory_size,
-            'hostname': lambda: platform.node(),
-            'gpu_memory': self.get_gpu_memory  # 예시로 추가
-        }
+    def __init__(self, sampler=None, settings_file='setting.txt', watch_settings=True):
+        # 시스템 정보 항목을 미리 정의한 딕셔너리로 매핑 (값은 프로세스에서 한 번만 계산해 둔 것을 사용)
+        static_info = get_static_info()
+        self.info_map = {key: functools.partial(static_info.get, key) for key in static_info}
+
+        # 부하는 백그라운드 스레드가 주기적으로 측정해 둔 최신 값을 읽으므로 기다리지 않음
+        self.sampler = sampler or LoadSampler()
+        self.sampler.start()
+        self.metrics_server = None
 
         # 부하 정보 항목도 미리 정의한 딕셔너리로 매핑
         self.load_map = {
-            'cpu': lambda: f"{psutil.cpu_percent(interval=1)} %",
-            'memory': lambda: f"{psutil.virtual_memory().percent} %",
+            'cpu': lambda: self.format_percent(self.sampler.get('cpu')),
+            'memory': lambda: self.format_percent(self.sampler.get('memory')),
+            'cpu_per_core': lambda: self.format_per_core(self.sampler.get('cpu_per_core')),
+            'disk': lambda: self.format_io(self.sampler.get('disk'), 'read_bytes', 'write_bytes'),
+            'network': lambda: self.format_io(self.sampler.get('network'), 'bytes_recv', 'bytes_sent'),
+            'process': lambda: self.format_processes(self.sampler.top_processes(5)),
         }
 
-    def load_settings(self):
-        info_keys = []
-        load_keys = []
-
+        # 출력할 항목: (정보 항목 tuple, 부하 항목 tuple)
+        # 설정을 다시 읽을 때는 새 tuple로 한 번에 바꾸므로, 출력하는 쪽은 항상 이전 설정이나 새 설정 중 하나를 온전히 봄
+        self.settings_file = settings_file
         try:
-            with open('setting.txt', 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('info_'):
-                        info_keys.append(line[5:])  # 'info_' 제거
-                    elif line.startswith('load_'):
-                        load_keys.append(line[5:])  # 'load_' 제거
+            self.active_settings = self.read_settings(settings_file)
         except FileNotFoundError:
             print("setting.txt 파일이 없습니다. 기본값으로 실행됩니다.")
-        return info_keys, load_keys
+            self.active_settings = ((), ())
 
-    def get_memory_size(self):
+        # 실행 중에 setting.txt가 바뀌면 다시 읽음 (측정 스레드는 멈추지 않음)
+        self.settings_watcher = None
+        if watch_settings:
+            self.settings_watcher = SettingsWatcher(settings_file, self.reload_settings)
+            self.settings_watcher.start()
+
+    @property
+    def info_settings(self):
+        return self.active_settings[0]
+
+    @property
+    def load_settings(self):
+        return self.active_settings[1]
+
+    def read_settings(self, path='setting.txt'):
+        """설정 파일에서 (정보 항목, 부하 항목)을 읽음. 중복된 항목은 처음 한 번만 사용
+
+        'info_', 'load_'로 시작하면 접두사를 떼고 해당 목록에 넣고,
+        접두사가 없으면 info_map, load_map 중 그 항목이 있는 쪽에 넣음.
+        """
+        info_keys = {}  # 순서를 유지하면서 중복을 없애기 위해 dict 사용
+        load_keys = {}
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('info_'):
+                    info_keys[line[5:]] = None  # 'info_' 제거
+                elif line.startswith('load_'):
+                    load_keys[line[5:]] = None  # 'load_' 제거
+                elif line in self.info_map:
+                    info_keys[line] = None
+                elif line in self.load_map:
+                    load_keys[line] = None
+                else:
+                    print(f"알 수 없는 설정 항목입니다: {line}")
+        return tuple(info_keys), tuple(load_keys)
+
+    def reload_settings(self):
+        """설정 파일을 다시 읽어 출력할 항목을 바꿈. 읽을 수 없으면 이전 설정을 유지"""
         try:
-            mem = psutil.virtual_memory().total
-            return f'{round(mem / (1024**3), 2)} GB'
-        except:
-            return '알 수 없음'
+            settings = self.read_settings(self.settings_file)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"설정 파일을 읽을 수 없어 이전 설정을 유지합니다: {e}")
+            return
+        if settings != self.active_settings:
+            self.active_settings = settings
+            print(f"설정을 다시 읽었습니다. 정보: {list(settings[0])}, 부하: {list(settings[1])}")
+
+    def get_memory_size(self):
+        return get_static_info()['memory_size']
 
     def get_gpu_memory(self):
-        # 실제 GPU 정보 가져오려면 nvidia-smi나 GPUtil 필요
-        return 'N/A (추후 구현)'
+        return get_static_info()['gpu_memory']
+
+    def format_percent(self, value):
+        # 첫 측정이 끝나기 전에는 값이 없음
+        return '측정 중' if value is None else f"{value} %"
+
+    def format_per_core(self, values):
+        if values is None:
+            return '측정 중'
+        return '[' + ', '.join(f"{value} %" for value in values) + ']'
+
+    def format_io(self, counters, read_key, write_key):
+        # 누적 바이트 수와 초당 바이트 수 (디스크는 읽기/쓰기, 네트워크는 받기/보내기)
+        if counters is None:
+            return '알 수 없음'
+        return (f"{{'{read_key}': {counters[read_key]}, '{read_key}_per_sec': {counters[read_key + '_per_sec']}, "
+                f"'{write_key}': {counters[write_key]}, '{write_key}_per_sec': {counters[write_key + '_per_sec']}}}")
+
+    def format_processes(self, processes):
+        # CPU 사용률이 높은 프로세스 (pid, 이름, 메모리(RSS, MB), CPU 사용률, 누적 CPU 시간(초))
+        if not processes:
+            return '측정 중'
+        lines = [
+            f"{{'pid': {p['pid']}, 'name': '{p['name']}', 'rss': {round(p['rss'] / (1024**2), 1)} MB, "
+            f"'cpu': {p['cpu_percent']} %, 'cpu_time': {p['cpu_time']} s}}"
+            for p in processes
+        ]
+        return '[\n    ' + ',\n    '.join(lines) + '\n  ]'
+
+    def start_metrics_server(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """/metrics(Prometheus), /api/info, /api/load(JSON)를 제공하는 HTTP 서버를 백그라운드에서 시작"""
+        if self.metrics_server is None:
+            self.metrics_server = MetricsServer(self.sampler, get_static_info(), host, port)
+            self.metrics_server.start()
+        return self.metrics_server
+
+    def close(self):
+        """설정 감시, HTTP 서버, 부하 측정 스레드를 멈춤"""
+        if self.settings_watcher is not None:
+            self.settings_watcher.stop()
+            self.settings_watcher = None
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        self.sampler.stop()
 
     def get_mission_computer_info(self):
         print('\n[미션 컴퓨터 시스템 정보]')
         print('{')
-        for i, key in enumerate(self.info_settings):
+        info_settings = self.info_settings  # 출력 도중 설정이 바뀌어도 같은 목록을 사용
+        for i, key in enumerate(info_settings):
             value = self.info_map.get(key, lambda: '알 수 없음')()
-            comma = ',' if i < len(self.info_settings) - 1 else ''
+            comma = ',' if i < len(info_settings) - 1 else ''
             print(f"  '{key}': {value}{comma}")
         print('}')
 
     def get_mission_computer_load(self):
         print('\n[미션 컴퓨터 실시간 부하]')
         print('{')
-        for i, key in enumerate(self.load_settings):
+        load_settings = self.load_settings
+        for i, key in enumerate(load_settings):
             value = self.load_map.get(key, lambda: '알 수 없음')()
-            comma = ',' if i < len(self.load_settings) - 1 else ''
+            comma = ',' if i < len(load_settings) - 1 else ''
             print(f"  '{key}_usage': {value}{comma}")
         print('}')
 
 
 # 실행 예시
-RunComputer = MissionComputer()
-RunComputer.get_mission_computer_info()
-RunComputer.get_mission_computer_load()
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 정보와 부하 출력')
+    parser.add_argument('--serve', action='store_true',
+                        help='출력한 뒤 종료하지 않고 HTTP로 메트릭 제공 (Ctrl+C로 종료)')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='HTTP 서버 주소')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='HTTP 서버 포트')
+    args = parser.parse_args()
+
+    RunComputer = MissionComputer()
+    try:
+        RunComputer.get_mission_computer_info()
+        RunComputer.sampler.wait_ready(2)  # 첫 부하 측정(약 1초)이 끝난 뒤 출력
+        RunComputer.get_mission_computer_load()
+        if args.serve:
+            server = RunComputer.start_metrics_server(args.host, args.port)
+            host, port = server.address[:2]
+            print(f'\n메트릭 제공 중: http://{host}:{port}/metrics (Ctrl+C로 종료)')
+            server.thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        RunComputer.close()
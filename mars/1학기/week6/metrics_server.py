@@ -0,0 +1,168 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 미션 컴퓨터의 정보와 부하를 HTTP로 제공하는 모듈.
+# 콘솔에 출력된 JSON 흉내 문자열을 읽어 가는 대신 다음 주소로 값을 가져갈 수 있다.
+#   /metrics    Prometheus 텍스트 형식
+#   /api/info   시스템 정보 (JSON)
+#   /api/load   최근 부하 측정값 (JSON)
+# 값은 LoadSampler가 백그라운드에서 측정해 둔 것만 사용하므로 요청이 와도 psutil을 호출하지 않는다.
+# 응답 본문은 측정값(snapshot)마다 한 번만 만들어 두고, 같은 측정값에 대한 요청에는 그대로 보낸다.
+# ThreadingHTTPServer는 요청마다 스레드를 만들기 때문에 여러 곳에서 동시에 가져가도 서로 기다리지 않는다.
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9100
+# /metrics에 내보내는 프로세스 수 (CPU 사용률 순). 프로세스 전체를 내보내면 시계열이 너무 많아짐
+DEFAULT_TOP_PROCESSES = 10
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+def escape_label(value):
+    """Prometheus 레이블 값에서 역슬래시, 따옴표, 줄바꿈을 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+class PrometheusText:
+    """Prometheus 텍스트 형식의 본문을 만드는 도우미. 메트릭마다 HELP, TYPE 줄을 한 번만 씀"""
+
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, help_text, samples):
+        """samples는 (레이블 딕셔너리, 값) 목록. 값이 None인 항목은 건너뜀"""
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            self.lines.append(f'{name}{format_labels(labels)} {value}')
+
+    def render(self):
+        return ('\n'.join(self.lines) + '\n').encode('utf-8')
+
+
+def render_prometheus(snapshot, static_info, top_processes=DEFAULT_TOP_PROCESSES):
+    text = PrometheusText()
+    text.metric('mars_system_info', 'gauge', 'Static mission computer information.', [
+        ({key: value for key, value in static_info.items() if key != 'cpu_cores'}, 1),
+    ])
+    text.metric('mars_cpu_cores', 'gauge', 'Number of logical CPU cores.', [({}, static_info.get('cpu_cores'))])
+    text.metric('mars_cpu_usage_percent', 'gauge', 'Total CPU usage.', [({}, snapshot.get('cpu'))])
+    text.metric('mars_cpu_core_usage_percent', 'gauge', 'CPU usage per core.', [
+        ({'core': core}, value) for core, value in enumerate(snapshot.get('cpu_per_core') or [])
+    ])
+    text.metric('mars_memory_usage_percent', 'gauge', 'Memory usage.', [({}, snapshot.get('memory'))])
+
+    disk = snapshot.get('disk') or {}
+    text.metric('mars_disk_read_bytes_total', 'counter', 'Bytes read from disks.', [({}, disk.get('read_bytes'))])
+    text.metric('mars_disk_written_bytes_total', 'counter', 'Bytes written to disks.', [({}, disk.get('write_bytes'))])
+    text.metric('mars_disk_reads_total', 'counter', 'Completed disk reads.', [({}, disk.get('read_count'))])
+    text.metric('mars_disk_writes_total', 'counter', 'Completed disk writes.', [({}, disk.get('write_count'))])
+
+    network = snapshot.get('network') or {}
+    text.metric('mars_network_receive_bytes_total', 'counter', 'Bytes received.', [({}, network.get('bytes_recv'))])
+    text.metric('mars_network_transmit_bytes_total', 'counter', 'Bytes sent.', [({}, network.get('bytes_sent'))])
+    text.metric('mars_network_receive_packets_total', 'counter', 'Packets received.', [({}, network.get('packets_recv'))])
+    text.metric('mars_network_transmit_packets_total', 'counter', 'Packets sent.', [({}, network.get('packets_sent'))])
+
+    processes = sorted(snapshot.get('processes') or [], key=lambda p: p['cpu_percent'] or 0, reverse=True)
+    processes = processes[:top_processes]
+    text.metric('mars_process_resident_memory_bytes', 'gauge', 'Resident memory of the busiest processes.', [
+        ({'pid': p['pid'], 'name': p['name']}, p['rss']) for p in processes
+    ])
+    text.metric('mars_process_cpu_seconds_total', 'counter', 'CPU time of the busiest processes.', [
+        ({'pid': p['pid'], 'name': p['name']}, p['cpu_time']) for p in processes
+    ])
+    text.metric('mars_process_cpu_usage_percent', 'gauge', 'CPU usage of the busiest processes.', [
+        ({'pid': p['pid'], 'name': p['name']}, p['cpu_percent']) for p in processes
+    ])
+
+    text.metric('mars_sample_timestamp_seconds', 'gauge', 'Time of the latest load sample.', [
+        ({}, snapshot.get('timestamp')),
+    ])
+    text.metric('mars_collect_cpu_seconds', 'gauge', 'CPU time spent collecting the latest sample.', [
+        ({}, snapshot.get('collect_seconds')),
+    ])
+    return text.render()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        body = self.server.metrics.render(path)
+        if body is None:
+            self.send_error(404)
+            return
+        content_type = PROMETHEUS_CONTENT_TYPE if path == '/metrics' else JSON_CONTENT_TYPE
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 콘솔에 기록하지 않음
+
+
+class MetricsServer:
+    def __init__(self, sampler, static_info, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 top_processes=DEFAULT_TOP_PROCESSES):
+        self.sampler = sampler
+        self.static_info = dict(static_info)
+        self.top_processes = top_processes
+        self.lock = threading.Lock()
+        self.cache_key = None  # 응답 본문을 만든 측정값의 측정 시각
+        self.cache = {}        # 경로 -> 응답 본문
+        self.info_body = json.dumps(self.static_info, ensure_ascii=False).encode('utf-8')
+        self.httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.metrics = self
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def render(self, path):
+        """경로의 응답 본문. 없는 경로이면 None"""
+        if path == '/api/info':
+            return self.info_body
+        if path not in ('/metrics', '/api/load'):
+            return None
+        snapshot = self.sampler.snapshot()
+        key = snapshot.get('timestamp')
+        with self.lock:
+            if key != self.cache_key:
+                # 새 측정값이 나왔으므로 이전 본문은 버림
+                self.cache_key = key
+                self.cache = {}
+            body = self.cache.get(path)
+            if body is None:
+                if path == '/metrics':
+                    body = render_prometheus(snapshot, self.static_info, self.top_processes)
+                else:
+                    body = json.dumps(snapshot, ensure_ascii=False).encode('utf-8')
+                self.cache[path] = body
+        return body
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.httpd.server_close()
@@ -0,0 +1,59 @@
+import os
+import threading
+
+# 설정 파일(setting.txt)이 바뀌면 다시 읽도록 알려주는 모듈.
+# interval마다 os.stat으로 수정 시각, 크기, inode만 확인하고 (파일은 열지 않음)
+# 바뀌었을 때만 on_change()를 호출한다.
+# 편집기가 새 파일을 만든 뒤 이름을 바꿔 저장하는 경우도 inode가 바뀌므로 알아챈다.
+
+# 기본 확인 간격 (초)
+DEFAULT_INTERVAL = 1.0
+
+
+def file_state(path):
+    """파일의 (수정 시각(ns), 크기, inode). 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class SettingsWatcher:
+    def __init__(self, path, on_change, interval=DEFAULT_INTERVAL):
+        if interval <= 0:
+            raise ValueError("interval은 0보다 커야 합니다.")
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.last_state = file_state(path)  # 시작할 때의 상태. 이미 읽은 설정이므로 다시 읽지 않음
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def check(self):
+        """파일이 바뀌었으면 on_change()를 호출하고 True를 반환"""
+        state = file_state(self.path)
+        if state == self.last_state:
+            return False
+        self.last_state = state
+        self.on_change()
+        return True
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"설정 파일 확인 중 오류 발생: {e}")
+
+    def start(self):
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name='settings-watcher', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None